@@ -1,10 +1,16 @@
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from langchain.chains.base import Chain
+from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables.base import RunnableSerializable
 
+from ai_enterprise_agent.interface.chat_history import IChatHistoryService
 from ai_enterprise_agent.interface.settings import (CHAIN_TYPE,
                                                     PROCESSING_TYPE, ISettings)
+from ai_enterprise_agent.services.cache.semantic_cache import SemanticCache
 from ai_enterprise_agent.services.chains.chain import ChainFactory
 from ai_enterprise_agent.services.chains.orchestrator_chain import \
     OrchestratorChain
@@ -13,6 +19,7 @@ from ai_enterprise_agent.services.chains.sequential_chain import \
 from ai_enterprise_agent.services.chat_history.memory import MemoryFactory
 from ai_enterprise_agent.services.llm.model import ModelFactory
 
+DEFAULT_BATCH_CONCURRENCY = 8
 
 class Agent:
 
@@ -20,6 +27,9 @@ class Agent:
     self.config = config
     self.model = ModelFactory.build(config.get('model'))
     self.memory = None
+    self.chains = None
+    self.semantic_cache = SemanticCache.from_config(config)
+    self.config_hash = SemanticCache.hash_config(config) if self.semantic_cache else None
 
   def validate_configuration(self):
     if self.config.get('processing_type') == None or self.config.get('chains') == None:
@@ -30,14 +40,14 @@ class Agent:
     if (self.config.get('processing_type') == PROCESSING_TYPE.single and chains_length > 1) or (self.config.get('processing_type') in [PROCESSING_TYPE.sequential, PROCESSING_TYPE.orchestrated] and chains_length == 1):
       raise ValueError(f"Invalid processing type: {self.config.get('processing_type').value} and number of chains: {chains_length}")
 
-  def build_chains(self):
+  def build_chains(self, memory: IChatHistoryService = None):
     self.validate_configuration()
     chains: List[CHAIN_TYPE] = self.config.get('chains')
 
     if self.config.get('processing_type') == PROCESSING_TYPE.single:
-      return ChainFactory.build(chains[0], self.config, model=self.model, memory=self.memory)
+      return ChainFactory.build(chains[0], self.config, model=self.model, memory=memory)
 
-    enabled_chains = [{'name': chain, 'chain': ChainFactory.build(chain, self.config, model=self.model, memory=self.memory)} for chain in chains]
+    enabled_chains = [{'name': chain, 'chain': ChainFactory.build(chain, self.config, model=self.model, memory=memory)} for chain in chains]
 
     if self.config.get('processing_type') == PROCESSING_TYPE.sequential:
       return CustomSequentialChain(config=self.config, chains=enabled_chains)
@@ -45,6 +55,28 @@ class Agent:
     if self.config.get('processing_type') == PROCESSING_TYPE.orchestrated:
       return OrchestratorChain(config=self.config, model=self.model, chains=enabled_chains)
 
+  def warm_up(self) -> Chain:
+    """
+    Build the chain graph once and keep it for the lifetime of the agent.
+    Database engines and vector store clients are created here, so later
+    calls only have to attach the per-thread memory.
+    """
+    if self.chains is None:
+      self.chains = self.build_chains()
+    return self.chains
+
+  def bind_memory(self, memory: IChatHistoryService) -> Chain:
+    """
+    Return shallow copies of the warm chains bound to the given memory.
+    Heavy resources (models, engines, vector stores) are shared, while the
+    copies keep concurrent conversations from seeing each other's memory.
+    """
+    chain = self.warm_up()
+    if isinstance(chain, (CustomSequentialChain, OrchestratorChain)):
+      chains = [{'name': item['name'], 'chain': item['chain'].copy(update={'memory': memory})} for item in chain.chains]
+      return chain.copy(update={'chains': chains})
+    return chain.copy(update={'memory': memory})
+
   def build_system_messages(self):
     config = self.config
     message = """
@@ -82,27 +114,137 @@ class Agent:
 
     return message
 
-  def refine_result(self, input: Dict[str, Any], result: Any | List):
+  def merge_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged = {}
+    for result in results:
+      if isinstance(result, dict):
+        merged.update(result)
+    return merged
+
+  def refine_chain(self) -> RunnableSerializable[Any, Any]:
     map_prompt = PromptTemplate.from_template(self.build_system_messages())
-    map_chain = map_prompt | self.model | StrOutputParser()
-    response = map_chain.invoke(input={
+    return map_prompt | self.model | StrOutputParser()
+
+  def refine_input(self, input: Dict[str, Any], result: Any | List) -> Dict[str, Any]:
+    return {
       "question": input.get('question'),
       "simple_chain": result.get('simple_chain', None),
       "sql_chain": result.get('sql_chain', None),
       "open_api_chain": result.get('open_api_chain', None),
       "vector_store_chain": result.get('vector_store_chain', None),
-    })
-    return response
+    }
+
+  def refine_result(self, input: Dict[str, Any], result: Any | List):
+    return self.refine_chain().invoke(input=self.refine_input(input, result))
+
+  async def arefine_result(self, input: Dict[str, Any], result: Any | List):
+    return await self.refine_chain().ainvoke(input=self.refine_input(input, result))
+
+  async def lookup_cache(self, input: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Any]:
+    if self.semantic_cache is None:
+      return None, None, None
+    try:
+      scope = self.semantic_cache.build_scope(self.config_hash, input.get('chat_thread_id'))
+      vector = await self.semantic_cache.aembed(input.get('question'))
+      return self.semantic_cache.lookup(scope, vector), scope, vector
+    except Exception as e:
+      print(f"Error reading semantic cache: {e}")
+      return None, None, None
+
+  def update_cache(self, scope: Optional[str], vector: Any, result: Any):
+    if self.semantic_cache is not None and scope is not None:
+      try:
+        self.semantic_cache.update(scope, vector, result)
+      except Exception as e:
+        print(f"Error writing semantic cache: {e}")
+
+  async def save_turn(self, memory: IChatHistoryService, input: Dict[str, Any], result: Any):
+    await memory.aadd_messages([HumanMessage(content=input.get('question')), AIMessage(content=result)])
 
   async def _call(self, input: Dict[str, Any]):
+    memory = MemoryFactory.build(self.config.get('history'), input.get('chat_thread_id'))
+    self.memory = memory
+    return await self.answer(input, memory)
+
+  async def answer(self, input: Dict[str, Any], memory: IChatHistoryService):
     config = self.config
-    self.memory = MemoryFactory.build(config.get('history'), input.get('chat_thread_id'))
-    chain = self.build_chains()
-    result = await chain._call(input)
-    if config.get('processing_type') == PROCESSING_TYPE.sequential:
-      result = self.refine_result(input, result[0])
+    result, scope, vector = await self.lookup_cache(input)
+    if result is None:
+      chain = self.bind_memory(memory)
+      result = await chain._call(input)
+      if config.get('processing_type') == PROCESSING_TYPE.sequential:
+        result = await self.arefine_result(input, self.merge_results(result))
+      self.update_cache(scope, vector, result)
 
-    self.memory.add_user_message(message=input.get('question'))
-    self.memory.add_ai_message(message=result)
+    await self.save_turn(memory, input, result)
 
     return result
+
+  async def abatch(self, inputs: List[Dict[str, Any]], max_concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> List[Any]:
+    """
+    Answer many questions with the chains built once and at most
+    max_concurrency questions in flight.
+
+    Questions sharing a chat_thread_id run in order against one memory, so
+    each sees the previous answers of its thread; distinct threads run
+    concurrently.
+
+    Args:
+        inputs (List[Dict[str, Any]]): The inputs, as accepted by _call.
+        max_concurrency (int): The maximum number of questions answered at once.
+
+    Returns:
+        List[Any]: The answers in input order; a failed question yields its exception.
+    """
+    self.warm_up()
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+    results: List[Any] = [None] * len(inputs)
+    threads: Dict[Any, List[int]] = {}
+    for i, input in enumerate(inputs):
+      thread_id = input.get('chat_thread_id')
+      threads.setdefault(thread_id if thread_id is not None else ('item', i), []).append(i)
+
+    async def run_thread(indexes: List[int]) -> None:
+      memory = MemoryFactory.build(self.config.get('history'), inputs[indexes[0]].get('chat_thread_id'))
+      for i in indexes:
+        async with semaphore:
+          try:
+            results[i] = await self.answer(inputs[i], memory)
+          except Exception as e:
+            results[i] = e
+
+    await asyncio.gather(*(run_thread(indexes) for indexes in threads.values()))
+    return results
+
+  async def stream(self, input: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Yield the answer tokens as they arrive from the model.
+
+    In single mode the configured chain is streamed, in orchestrated mode the
+    chain picked by the orchestrator and in sequential mode the refine step.
+    The full answer is written to memory once the stream ends.
+    """
+    config = self.config
+    memory = MemoryFactory.build(config.get('history'), input.get('chat_thread_id'))
+    self.memory = memory
+    cached, scope, vector = await self.lookup_cache(input)
+    if cached is not None:
+      yield cached
+      await self.save_turn(memory, input, cached)
+      return
+
+    chain = self.bind_memory(memory)
+    if config.get('processing_type') == PROCESSING_TYPE.sequential:
+      result = await chain._call(input)
+      tokens = self.refine_chain().astream(self.refine_input(input, self.merge_results(result)))
+    else:
+      tokens = chain._astream(input)
+
+    chunks: List[str] = []
+    async for token in tokens:
+      chunks.append(token)
+      yield token
+
+    result = ''.join(chunks)
+    self.update_cache(scope, vector, result)
+    await self.save_turn(memory, input, result)
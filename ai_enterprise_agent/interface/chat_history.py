@@ -27,3 +27,15 @@ class IChatHistoryService:
 
   def clear(self):
     pass
+
+  async def aadd_messages(self, messages: Sequence[BaseMessage]) -> None:
+    pass
+
+  async def aload_memory_variables(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    pass
+
+  def aget_messages(self):
+    pass
+
+  async def aclear(self):
+    pass
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 
 class LLM_TYPE(Enum):
@@ -13,6 +13,7 @@ class VECTOR_STORE_TYPE(Enum):
     open_search = 'open_search'
     vertex_search = 'vertex_search'
     pinecone = 'pinecone'
+    local = 'local'
 
 class DIALECT_TYPE(Enum):
     postgres = 'postgres'
@@ -39,6 +40,11 @@ class PROCESSING_TYPE(Enum):
 class DOCUMENT_INTELLIGENCE_TYPE(Enum):
     azure = 'azure'
 
+class CACHE_TYPE(Enum):
+    memory = 'memory'
+    sqlite = 'sqlite'
+    redis = 'redis'
+
 class IModel:
     type: LLM_TYPE
     model: str
@@ -49,6 +55,7 @@ class IModel:
     secret_access_key: Optional[str]
     session_token: Optional[str]
     region: Optional[str]
+    cache: Optional['ILLMCache']
 
 class IDatabase:
     type: DIALECT_TYPE
@@ -60,18 +67,36 @@ class IDatabase:
     database = Optional[str]
     includes_tables = Optional[str]
     custom_system_message: Optional[str]
+    schema_ttl: Optional[int]
+    pool_size: Optional[int]
+    max_overflow: Optional[int]
+    pool_pre_ping: Optional[bool]
+    pool_recycle: Optional[int]
+    pool_timeout: Optional[int]
+
+class IHttpCache:
+    enabled: bool = True
+    ttl: Optional[int]
+    max_size: Optional[int]
+    auth_header: Optional[str]
 
 class IOpenApi:
     data: str
     token: Optional[str]
     allow_dangerous_requests: bool
     custom_system_message: Optional[str]
+    top_k: Optional[int]
+    timeout: Optional[float]
+    max_retries: Optional[int]
+    max_connections_per_host: Optional[int]
+    cache: Optional[IHttpCache]
 
 class IEmbedding:
     model_deployment: Optional[str]
     api_version: Optional[str]
     endpoint: Optional[str]
     api_key: Optional[str]
+    cache: Optional['IEmbeddingCache']
 
 class IVectorSearch:
     type: VECTOR_STORE_TYPE
@@ -89,6 +114,15 @@ class IVectorSearch:
     fields_content_vector: Optional[str]
     vector_search_profile_name: Optional[str]
     cloud: Optional[str]
+    path: Optional[str]
+    ann: Optional[str]
+    nlist: Optional[int]
+    nprobe: Optional[int]
+    ivf_min_rows: Optional[int]
+    vector_dtype: Optional[str]
+    quantization: Optional[str]
+    rerank_factor: Optional[int]
+    cache: Optional['IRetrievalCache']
 
 class IChatHistory:
     type: DATABASE_TYPE
@@ -103,6 +137,52 @@ class IChatHistory:
     container: Optional[str]
     synchronize: bool = False
     limit: Optional[int]
+    max_connections: Optional[int]
+    health_check_interval: Optional[int]
+
+class IEmbeddingCache:
+    enabled: bool = True
+    max_size: Optional[int]
+    ttl: Optional[int]
+    redis: Optional[IChatHistory]
+
+class IRetrievalCache:
+    enabled: bool = True
+    ttl: Optional[int]
+    max_size: Optional[int]
+
+class IIngestion:
+    batch_size: Optional[int]
+    max_concurrency: Optional[int]
+    max_retries: Optional[int]
+    retry_backoff: Optional[float]
+    chunk_size: Optional[int]
+    chunk_overlap: Optional[int]
+    encoding: Optional[str]
+    incremental: bool = True
+    manifest_dir: Optional[str]
+
+class ISemanticCache:
+    enabled: bool = True
+    threshold: Optional[float]
+    ttl: Optional[int]
+    max_size: Optional[int]
+    per_thread: bool = False
+    embedding: Optional[IEmbedding]
+
+class ILLMCache:
+    type: CACHE_TYPE = CACHE_TYPE.memory
+    enabled: bool = True
+    max_size: Optional[int]
+    path: Optional[str]
+    ttl: Optional[int]
+    redis: Optional[IChatHistory]
+
+class IRouter:
+    enabled: bool = True
+    margin: Optional[float]
+    min_score: Optional[float]
+    keywords: Optional[Dict[CHAIN_TYPE, List[str]]]
 
 class ISystem:
     system_message: str
@@ -121,4 +201,7 @@ class ISettings:
     vector_store: Optional[IVectorSearch]
     history: Optional[IChatHistory]
     document_intelligence: Optional[IDocumentIntelligence]
+    ingestion: Optional[IIngestion]
+    semantic_cache: Optional[ISemanticCache]
+    router: Optional[IRouter]
     system: ISystem
@@ -0,0 +1,134 @@
+import hashlib
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from cachetools import LRUCache
+from langchain_core.embeddings import Embeddings
+from redis import Redis
+
+from ai_enterprise_agent.interface.settings import IChatHistory, IEmbeddingCache
+from ai_enterprise_agent.utils.executor_helper import run_in_executor
+from ai_enterprise_agent.utils.redis_helper import RedisRegistry
+
+DEFAULT_MAX_SIZE = 10000
+
+_local_caches: Dict[str, LRUCache] = {}
+_local_lock = threading.Lock()
+
+
+class CachedEmbeddings(Embeddings):
+  """
+  Embeddings wrapper that serves repeated texts from a bounded in-process LRU
+  and, optionally, from Redis before calling the underlying provider.
+
+  Entries are keyed by provider, model deployment and the SHA-256 of the
+  text, so the in-process tier is shared by every wrapper of the same model.
+  """
+
+  def __init__(self, embeddings: Embeddings, provider: str, model: Optional[str], config: IEmbeddingCache = None) -> None:
+    config = config or {}
+    self.embeddings = embeddings
+    self.namespace = f"{provider}:{model}"
+    self.ttl = config.get('ttl')
+    self.local = self.get_local_cache(self.namespace, config.get('max_size') or DEFAULT_MAX_SIZE)
+    self.redis = self.build_redis(config.get('redis'))
+    self.hits = 0
+    self.misses = 0
+
+  @staticmethod
+  def get_local_cache(namespace: str, max_size: int) -> LRUCache:
+    with _local_lock:
+      cache = _local_caches.get(namespace)
+      if cache is None:
+        cache = LRUCache(maxsize=max_size)
+        _local_caches[namespace] = cache
+      return cache
+
+  @staticmethod
+  def build_redis(config: Optional[IChatHistory]) -> Optional[Redis]:
+    if not config:
+      return None
+    return RedisRegistry.get_client(config)
+
+  def build_key(self, text: str) -> str:
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return f"embedding:{self.namespace}:{digest}"
+
+  def stats(self) -> Dict[str, int]:
+    return {'hits': self.hits, 'misses': self.misses, 'size': len(self.local)}
+
+  def lookup(self, keys: List[str]) -> List[Optional[List[float]]]:
+    with _local_lock:
+      vectors = [self.local.get(key) for key in keys]
+
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if self.redis is not None and missing:
+      try:
+        values = self.redis.mget([keys[i] for i in missing])
+      except Exception as e:
+        print(f"Error reading embedding cache: {e}")
+        values = [None] * len(missing)
+      with _local_lock:
+        for i, value in zip(missing, values):
+          if value is not None:
+            vector = array('f', value).tolist()
+            vectors[i] = vector
+            self.local[keys[i]] = vector
+
+    hits = sum(1 for vector in vectors if vector is not None)
+    self.hits += hits
+    self.misses += len(vectors) - hits
+    return vectors
+
+  def store(self, keys: List[str], vectors: List[List[float]]) -> None:
+    with _local_lock:
+      for key, vector in zip(keys, vectors):
+        self.local[key] = vector
+
+    if self.redis is not None and keys:
+      try:
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, vector in zip(keys, vectors):
+          pipeline.set(key, array('f', vector).tobytes(), ex=self.ttl)
+        pipeline.execute()
+      except Exception as e:
+        print(f"Error writing embedding cache: {e}")
+
+  def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    keys = [self.build_key(text) for text in texts]
+    vectors = self.lookup(keys)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+      computed = self.embeddings.embed_documents([texts[i] for i in missing])
+      for i, vector in zip(missing, computed):
+        vectors[i] = vector
+      self.store([keys[i] for i in missing], computed)
+    return vectors
+
+  def embed_query(self, text: str) -> List[float]:
+    key = self.build_key(text)
+    vector = self.lookup([key])[0]
+    if vector is None:
+      vector = self.embeddings.embed_query(text)
+      self.store([key], [vector])
+    return vector
+
+  async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+    keys = [self.build_key(text) for text in texts]
+    vectors = await run_in_executor(self.lookup, keys)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+      computed = await self.embeddings.aembed_documents([texts[i] for i in missing])
+      for i, vector in zip(missing, computed):
+        vectors[i] = vector
+      await run_in_executor(self.store, [keys[i] for i in missing], computed)
+    return vectors
+
+  async def aembed_query(self, text: str) -> List[float]:
+    key = self.build_key(text)
+    vector = (await run_in_executor(self.lookup, [key]))[0]
+    if vector is None:
+      vector = await self.embeddings.aembed_query(text)
+      await run_in_executor(self.store, [key], [vector])
+    return vector
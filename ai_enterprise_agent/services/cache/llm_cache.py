@@ -0,0 +1,89 @@
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from cachetools import LRUCache
+from langchain_core.caches import BaseCache
+from langchain_core.outputs import Generation
+
+from ai_enterprise_agent.interface.settings import CACHE_TYPE, ILLMCache
+from ai_enterprise_agent.utils.redis_helper import RedisRegistry
+
+DEFAULT_MAX_SIZE = 1000
+DEFAULT_SQLITE_PATH = '.langchain.db'
+
+
+class InMemoryLRUCache(BaseCache):
+  """
+  Bounded in-process LLM cache. LangChain keys entries by the rendered
+  messages and the model string, which carries provider, model, temperature
+  and stop sequences.
+  """
+
+  def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+    self.cache = LRUCache(maxsize=max_size)
+    self.lock = threading.Lock()
+
+  def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+    with self.lock:
+      return self.cache.get((prompt, llm_string))
+
+  def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+    with self.lock:
+      self.cache[(prompt, llm_string)] = return_val
+
+  def clear(self, **kwargs: Any) -> None:
+    with self.lock:
+      self.cache.clear()
+
+
+class LLMCacheFactory:
+
+  _caches: Dict[str, BaseCache] = {}
+  _lock = threading.Lock()
+
+  @staticmethod
+  def build(config: Optional[ILLMCache], temperature: Optional[float]) -> Optional[BaseCache]:
+    """
+    Build the response cache for a chat model. Caching is deterministic only
+    for greedy decoding, so it is enabled only when temperature is 0.
+
+    Args:
+        config (ILLMCache): The cache configuration.
+        temperature (float): The model temperature.
+
+    Returns:
+        BaseCache or None: The shared cache backend, if caching applies.
+    """
+    if not config or not config.get('enabled', True) or temperature != 0:
+      return None
+
+    cache_type = config.get('type', CACHE_TYPE.memory)
+    if cache_type == CACHE_TYPE.memory:
+      key = f"memory:{config.get('max_size') or DEFAULT_MAX_SIZE}"
+    elif cache_type == CACHE_TYPE.sqlite:
+      key = f"sqlite:{config.get('path') or DEFAULT_SQLITE_PATH}"
+    elif cache_type == CACHE_TYPE.redis:
+      redis = config.get('redis') or {}
+      key = f"redis:{redis.get('host')}:{redis.get('port')}:{redis.get('database')}"
+    else:
+      raise ValueError("Invalid cache type: {}".format(cache_type))
+
+    with LLMCacheFactory._lock:
+      cache = LLMCacheFactory._caches.get(key)
+      if cache is None:
+        cache = LLMCacheFactory.create(cache_type, config)
+        LLMCacheFactory._caches[key] = cache
+      return cache
+
+  @staticmethod
+  def create(cache_type: CACHE_TYPE, config: ILLMCache) -> BaseCache:
+    if cache_type == CACHE_TYPE.sqlite:
+      from langchain_community.cache import SQLiteCache
+      return SQLiteCache(database_path=config.get('path') or DEFAULT_SQLITE_PATH)
+
+    if cache_type == CACHE_TYPE.redis:
+      from langchain_community.cache import RedisCache
+      client = RedisRegistry.get_client(config.get('redis') or {})
+      return RedisCache(redis_=client, ttl=config.get('ttl'))
+
+    return InMemoryLRUCache(max_size=config.get('max_size') or DEFAULT_MAX_SIZE)
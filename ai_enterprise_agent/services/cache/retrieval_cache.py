@@ -0,0 +1,90 @@
+import hashlib
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from langchain_core.documents import Document
+
+from ai_enterprise_agent.interface.settings import IRetrievalCache
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_SIZE = 1000
+
+
+class RetrievalCache:
+  """
+  TTL and LRU cache of similarity search results for one vector index,
+  keyed by the normalized query, k and the filters.
+
+  There is one cache per index (store type, endpoint or path, and name) in
+  the process, so every chain reading an index shares its results, and the
+  ingestion pipeline clears it whenever it writes to that index. Writes from
+  other processes are only picked up once the TTL expires, even when the
+  index itself already sees them (the local index reopens a file replaced
+  by another process).
+  """
+
+  _caches: Dict[Tuple[str, str, str], 'RetrievalCache'] = {}
+  _lock = threading.Lock()
+
+  def __init__(self, ttl: int = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE) -> None:
+    self.cache = TTLCache(maxsize=max_size, ttl=ttl)
+    self.lock = threading.Lock()
+
+  @staticmethod
+  def build_index_key(vector_store_config: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Identify the index by store type, location and name. The location is the
+    endpoint or local path; stores without either (Pinecone) are told apart
+    by a digest of their API key, so tenants never share cached results.
+    """
+    store_type = vector_store_config.get('type')
+    location = vector_store_config.get('endpoint') or vector_store_config.get('path')
+    if not location and vector_store_config.get('api_key'):
+      location = hashlib.sha256(vector_store_config.get('api_key').encode('utf-8')).hexdigest()
+    return (getattr(store_type, 'value', str(store_type)), location or '', vector_store_config.get('index_name') or 'default')
+
+  @staticmethod
+  def for_index(vector_store_config: Dict[str, Any]) -> Optional['RetrievalCache']:
+    """
+    Return the cache of the configured index, when caching is enabled.
+    """
+    config: Optional[IRetrievalCache] = vector_store_config.get('cache')
+    if not config or not config.get('enabled', True):
+      return None
+    key = RetrievalCache.build_index_key(vector_store_config)
+    with RetrievalCache._lock:
+      cache = RetrievalCache._caches.get(key)
+      if cache is None:
+        cache = RetrievalCache(ttl=config.get('ttl') or DEFAULT_TTL, max_size=config.get('max_size') or DEFAULT_MAX_SIZE)
+        RetrievalCache._caches[key] = cache
+      return cache
+
+  @staticmethod
+  def invalidate(vector_store_config: Dict[str, Any]) -> None:
+    """
+    Drop the cached results of the configured index after it was written to.
+    """
+    cache = RetrievalCache._caches.get(RetrievalCache.build_index_key(vector_store_config))
+    if cache is not None:
+      cache.clear()
+
+  @staticmethod
+  def build_key(query: str, k: int, filters: Any) -> str:
+    normalized = re.sub(r'\s+', ' ', (query or '').strip().lower())
+    return json.dumps([normalized, k, filters], sort_keys=True, default=str)
+
+  def get(self, key: str) -> Optional[List[Document]]:
+    with self.lock:
+      documents = self.cache.get(key)
+    return list(documents) if documents is not None else None
+
+  def set(self, key: str, documents: List[Document]) -> None:
+    with self.lock:
+      self.cache[key] = list(documents)
+
+  def clear(self) -> None:
+    with self.lock:
+      self.cache.clear()
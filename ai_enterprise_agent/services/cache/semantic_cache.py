@@ -0,0 +1,165 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ai_enterprise_agent.interface.settings import ISemanticCache, ISettings
+from ai_enterprise_agent.services.vector_store.embedding import \
+    EmbeddingFactory
+
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_TTL = 3600
+DEFAULT_MAX_SIZE = 1000
+
+
+@dataclass
+class SemanticCacheEntry:
+  vector: np.ndarray
+  answer: str
+  expires_at: float
+
+
+class SemanticCacheBackend:
+  """
+  Storage contract of the semantic cache. Vectors are L2-normalized, so the
+  dot product is the cosine similarity.
+  """
+
+  def search(self, scope: str, vector: np.ndarray) -> Optional[Tuple[float, str]]:
+    pass
+
+  def add(self, scope: str, vector: np.ndarray, answer: str) -> None:
+    pass
+
+  def clear(self, scope: Optional[str] = None) -> None:
+    pass
+
+
+class InMemorySemanticCacheBackend(SemanticCacheBackend):
+  """
+  In-process backend: entries grouped by scope under a global LRU order, plus
+  a stacked vector matrix per scope rebuilt lazily after writes, so a lookup
+  is a single matrix product.
+  """
+
+  def __init__(self, ttl: int = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE) -> None:
+    self.ttl = ttl
+    self.max_size = max_size
+    self.scopes: Dict[str, OrderedDict] = {}
+    self.matrices: Dict[str, Tuple[List[int], np.ndarray]] = {}
+    self.order: OrderedDict = OrderedDict()
+    self.counter = 0
+    self.lock = threading.Lock()
+
+  def evict_expired(self, scope: str, now: float) -> None:
+    entries = self.scopes.get(scope)
+    if not entries:
+      return
+    expired = [key for key, entry in entries.items() if entry.expires_at <= now]
+    for key in expired:
+      del entries[key]
+      self.order.pop((scope, key), None)
+    if expired:
+      self.matrices.pop(scope, None)
+
+  def evict_oldest(self) -> None:
+    while len(self.order) > self.max_size:
+      (scope, key), _ = self.order.popitem(last=False)
+      self.scopes[scope].pop(key, None)
+      self.matrices.pop(scope, None)
+
+  def search(self, scope: str, vector: np.ndarray) -> Optional[Tuple[float, str]]:
+    with self.lock:
+      self.evict_expired(scope, time.monotonic())
+      entries = self.scopes.get(scope)
+      if not entries:
+        return None
+      if scope not in self.matrices:
+        keys = list(entries.keys())
+        self.matrices[scope] = (keys, np.stack([entries[key].vector for key in keys]))
+      keys, matrix = self.matrices[scope]
+      scores = matrix @ vector
+      best = int(np.argmax(scores))
+      key = keys[best]
+      self.order.move_to_end((scope, key))
+      return float(scores[best]), entries[key].answer
+
+  def add(self, scope: str, vector: np.ndarray, answer: str) -> None:
+    with self.lock:
+      entries = self.scopes.setdefault(scope, OrderedDict())
+      self.counter += 1
+      entries[self.counter] = SemanticCacheEntry(vector=vector, answer=answer, expires_at=time.monotonic() + self.ttl)
+      self.order[(scope, self.counter)] = None
+      self.matrices.pop(scope, None)
+      self.evict_oldest()
+
+  def clear(self, scope: Optional[str] = None) -> None:
+    with self.lock:
+      scopes = [scope] if scope is not None else list(self.scopes.keys())
+      for key in scopes:
+        for entry_key in self.scopes.pop(key, {}):
+          self.order.pop((key, entry_key), None)
+        self.matrices.pop(key, None)
+
+
+class SemanticCache:
+  """
+  Answer cache keyed by question embedding. A question whose cosine
+  similarity with a previously answered one, in the same scope, reaches the
+  threshold gets the cached answer without running the chains.
+  """
+
+  def __init__(self, embeddings: Embeddings, backend: SemanticCacheBackend, threshold: float = DEFAULT_THRESHOLD, per_thread: bool = False) -> None:
+    self.embeddings = embeddings
+    self.backend = backend
+    self.threshold = threshold
+    self.per_thread = per_thread
+
+  @staticmethod
+  def from_config(config: ISettings) -> Optional['SemanticCache']:
+    cache_config: ISemanticCache = config.get('semantic_cache')
+    if not cache_config or not cache_config.get('enabled', True):
+      return None
+
+    embedding_config = cache_config.get('embedding') or (config.get('vector_store') or {}).get('embedding')
+    backend = InMemorySemanticCacheBackend(
+      ttl=cache_config.get('ttl') or DEFAULT_TTL,
+      max_size=cache_config.get('max_size') or DEFAULT_MAX_SIZE,
+    )
+    return SemanticCache(
+      embeddings=EmbeddingFactory.build_for_model(config, embedding_config),
+      backend=backend,
+      threshold=DEFAULT_THRESHOLD if cache_config.get('threshold') is None else cache_config.get('threshold'),
+      per_thread=cache_config.get('per_thread', False),
+    )
+
+  @staticmethod
+  def hash_config(config: ISettings) -> str:
+    settings = {key: value for key, value in dict(config).items() if key not in ('history', 'semantic_cache')}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+  def build_scope(self, config_hash: str, chat_thread_id: Optional[str]) -> str:
+    if self.per_thread:
+      return f"{config_hash}:{chat_thread_id}"
+    return config_hash
+
+  async def aembed(self, question: str) -> np.ndarray:
+    vector = np.asarray(await self.embeddings.aembed_query(question), dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+  def lookup(self, scope: str, vector: np.ndarray) -> Optional[str]:
+    match = self.backend.search(scope, vector)
+    if match and match[0] >= self.threshold:
+      return match[1]
+    return None
+
+  def update(self, scope: str, vector: np.ndarray, answer: Any) -> None:
+    if isinstance(answer, str) and answer:
+      self.backend.add(scope, vector, answer)
@@ -1,16 +1,20 @@
 import json
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 
 from langchain.chains.base import Chain
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langchain_core.runnables.base import RunnableSerializable
 
 from ai_enterprise_agent.interface.chat_history import IChatHistoryService
 from ai_enterprise_agent.interface.settings import PROCESSING_TYPE, ISettings
-from ai_enterprise_agent.utils.fetch_helper import fetch
+from ai_enterprise_agent.utils.fetch_helper import afetch, fetch
+from ai_enterprise_agent.utils.http_cache_helper import HttpResponseCache
+from ai_enterprise_agent.utils.open_api_helper import OperationIndex
+
+DEFAULT_TOP_K = 5
 
 
 class OpenApiChain(Chain):
@@ -20,6 +24,8 @@ class OpenApiChain(Chain):
   model: BaseChatModel = None
   memory: IChatHistoryService = None
   open_api: Dict[str, Any] = None
+  operation_index: OperationIndex = None
+  http_cache: Optional[HttpResponseCache] = None
   config: ISettings = None
 
   @property
@@ -36,10 +42,10 @@ class OpenApiChain(Chain):
     self.memory = memory
     self.open_api = config.get('open_api')
     self.config = config
+    self.operation_index = OperationIndex.from_data(self.open_api.get('data'))
+    self.http_cache = HttpResponseCache.from_config(self.open_api.get('cache'))
 
-  def get_fetch(self, question, custom_system_message) -> str:
-    open_api = self.open_api
-    schema = open_api.get('data')
+  def build_fetch_chain(self) -> RunnableSerializable[Any, Any]:
     template = """
       You are an AI with expertise in OpenAPI and Swagger.
       You should follow the following rules when generating an answer:
@@ -57,13 +63,58 @@ class OpenApiChain(Chain):
       API ANSWER:
     """
     prompt = ChatPromptTemplate.from_template(template)
-    chain = prompt | self.model | StrOutputParser()
-    return chain.invoke({"schema": schema, "question": question, "history": self.memory.get_messages(), "custom_system_message": custom_system_message})
+    return prompt | self.model | StrOutputParser()
+
+  def build_schema(self, question: str) -> str:
+    """
+    Return only the operations relevant to the question, falling back to the
+    raw specification when it has no parseable paths.
+    """
+    open_api = self.open_api
+    index = self.operation_index
+    if index is None or not index.operations:
+      return open_api.get('data')
+    operations = index.search(question, k=open_api.get('top_k') or DEFAULT_TOP_K)
+    return index.render(operations)
+
+  def build_fetch_input(self, question, custom_system_message, history) -> Dict[str, Any]:
+    schema = self.build_schema(question)
+    return {"schema": schema, "question": question, "history": history, "custom_system_message": custom_system_message}
+
+  def get_fetch(self, question, custom_system_message) -> str:
+    history = self.memory.get_messages()({}).get('history')
+    return self.build_fetch_chain().invoke(self.build_fetch_input(question, custom_system_message, history))
+
+  async def aget_fetch(self, question, custom_system_message) -> str:
+    history = (await self.memory.aget_messages()({})).get('history')
+    return await self.build_fetch_chain().ainvoke(self.build_fetch_input(question, custom_system_message, history))
 
-  def chain(self, question, custom_system_message) -> RunnableSerializable[Any, Any]:
-    fetch_sentence = self.get_fetch(question, custom_system_message)
+  def build_request(self, fetch_sentence: str) -> Dict[str, Any]:
     request = json.loads(fetch_sentence)
-    response = fetch(url=request.get('url'), method=request.get('method'), data=request.get('data'), headers=request.get('headers'))
+    open_api = self.open_api
+    options = {
+      'timeout': open_api.get('timeout'),
+      'max_retries': open_api.get('max_retries'),
+      'max_connections_per_host': open_api.get('max_connections_per_host'),
+    }
+    return {
+      'url': request.get('url'),
+      'method': request.get('method'),
+      'data': request.get('data'),
+      'headers': request.get('headers'),
+      'cache': self.http_cache,
+      **{key: value for key, value in options.items() if value is not None},
+    }
+
+  def call_api(self, input: Dict[str, Any]):
+    fetch_sentence = self.get_fetch(input.get('question'), input.get('custom_system_message'))
+    return fetch(**self.build_request(fetch_sentence))
+
+  async def acall_api(self, input: Dict[str, Any]):
+    fetch_sentence = await self.aget_fetch(input.get('question'), input.get('custom_system_message'))
+    return await afetch(**self.build_request(fetch_sentence))
+
+  def chain(self) -> RunnableSerializable[Any, Any]:
     template = """
         Based on the context below, answer the question with natural language.
         You should follow the following rules when generating and answer:
@@ -73,15 +124,15 @@ class OpenApiChain(Chain):
         Question: {question}
       """
     prompt = ChatPromptTemplate.from_template(template)
-    chain = (RunnablePassthrough.assign(context=lambda _: response)) | prompt | self.model | StrOutputParser()
+    chain = RunnablePassthrough.assign(context=RunnableLambda(self.call_api, afunc=self.acall_api)) | prompt | self.model | StrOutputParser()
     return chain
 
   async def _call(self, input: Dict[str, Any] = None):
     try:
       question = input['question']
       custom_system_message = input.get('custom_system_message', None)
-      chain = self.chain(question, custom_system_message)
-      result = chain.invoke(input={'question': question})
+      chain = self.chain()
+      result = await chain.ainvoke(input={'question': question, 'custom_system_message': custom_system_message})
       if self.config.get('processing_type') == PROCESSING_TYPE.sequential:
         return { self.output_key: result }
       return result
@@ -90,6 +141,20 @@ class OpenApiChain(Chain):
       if not result.startswith("Could not parse LLM output: `"):
           raise e
       result = result.removeprefix("Could not parse LLM output: `").removesuffix("`")
+      if self.config.get('processing_type') == PROCESSING_TYPE.sequential:
+        return { self.output_key: result }
+      return result
+
+  async def _astream(self, input: Dict[str, Any]) -> AsyncIterator[str]:
+    try:
+      chain = self.chain()
+      async for token in chain.astream(input={'question': input['question'], 'custom_system_message': input.get('custom_system_message', None)}):
+        yield token
+    except ValueError as e:
+      result = str(e)
+      if not result.startswith("Could not parse LLM output: `"):
+          raise e
+      yield result.removeprefix("Could not parse LLM output: `").removesuffix("`")
 
   @property
   def _chain_type(self) -> str:
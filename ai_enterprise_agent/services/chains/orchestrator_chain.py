@@ -1,11 +1,21 @@
-from typing import Any, Dict, List, Optional
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from langchain.chains.base import Chain
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables.base import RunnableSerializable
 
 from ai_enterprise_agent.interface.settings import CHAIN_TYPE, ISettings
+from ai_enterprise_agent.services.chains.router import (KeywordRouter,
+                                                        RoutingDigest)
+from ai_enterprise_agent.services.ingestion.manifest import IndexManifest
+from ai_enterprise_agent.utils.executor_helper import run_in_executor
+from ai_enterprise_agent.utils.open_api_helper import OperationIndex
+
+DOCUMENT_LABEL_COUNT = 5
+DOCUMENT_LABEL_SIZE = 200
 
 
 class OrchestratorChain(Chain):
@@ -15,9 +25,11 @@ class OrchestratorChain(Chain):
   model: BaseChatModel = None
   config: Dict[str, Any] = None
   chains: List[Chain] = None
-  open_api_schema: Dict[str, Any] = None
-  database_schema: Dict[str, Any] = None
-  documents: Dict[str, Any] = None
+  open_api_schema: Optional[str] = None
+  database_schema: Optional[str] = None
+  documents: Optional[str] = None
+  router: KeywordRouter = None
+  routing_digest: RoutingDigest = None
 
   @property
   def input_keys(self):
@@ -32,34 +44,103 @@ class OrchestratorChain(Chain):
     self.config = config
     self.model = model
     self.chains = chains
+    self.router = KeywordRouter.from_config(config.get('router'))
+    self.routing_digest = RoutingDigest()
+
+  def find_chain(self, name: CHAIN_TYPE) -> Optional[Dict[str, Chain]]:
+    return next((item for item in self.chains if item["name"] == name), None)
+
+  def manifest(self) -> IndexManifest:
+    vector_store = self.config.get('vector_store') or {}
+    ingestion = self.config.get('ingestion') or {}
+    return IndexManifest.for_index(vector_store, ingestion.get('manifest_dir'))
+
+  def document_titles(self, manifest: Optional[IndexManifest] = None) -> List[str]:
+    manifest = manifest or self.manifest()
+    return [os.path.splitext(key.split('/', 1)[-1])[0] for key in manifest.keys()]
+
+  def refresh_routing(self) -> None:
+    """
+    Rebuild the sections of the routing digest whose source changed (schema,
+    OpenAPI spec or ingestion manifest) and re-index the keyword router.
+    """
+    changed = False
+    for item in self.chains:
+      name = item['name']
+      if name == CHAIN_TYPE.sql_chain:
+        sql_chain = item['chain']
+        schema = sql_chain.get_schema(None)
+        changed |= self.routing_digest.update(name, schema, lambda: RoutingDigest.from_tables(sql_chain.get_tables(schema)))
+      elif name == CHAIN_TYPE.open_api_chain:
+        data = (self.config.get('open_api') or {}).get('data')
+        changed |= self.routing_digest.update(name, data, lambda: RoutingDigest.from_operations(OperationIndex.from_data(data).operations))
+      elif name == CHAIN_TYPE.vector_store_chain:
+        manifest = self.manifest()
+        changed |= self.routing_digest.update(name, manifest.modified_at(), lambda: RoutingDigest.from_titles(self.document_titles(manifest)))
+
+    if self.router is not None and (changed or not self.router.indexed):
+      self.router.index(self.build_domains())
+
+  def build_domains(self) -> Dict[CHAIN_TYPE, List[str]]:
+    keywords = (self.config.get('router') or {}).get('keywords') or {}
+    domains: Dict[CHAIN_TYPE, List[str]] = {}
+    for item in self.chains:
+      name = item['name']
+      if name == CHAIN_TYPE.simple_chain:
+        continue
+      domains[name] = list(keywords.get(name) or keywords.get(name.value) or []) + self.routing_digest.terms(name)
+    return domains
+
+  def pre_route(self, question: str) -> Optional[Chain]:
+    """
+    Pick a chain locally when the keyword router is confident enough,
+    returning None to fall back to the LLM router. Refreshes the routing
+    digest that build_knowledge then reads, so it must run first.
+    """
+    self.refresh_routing()
+    if self.router is None:
+      return None
+    name = self.router.route(question)
+    item = self.find_chain(name) if name else None
+    return item['chain'] if item else None
+
+  def format_documents(self, documents: List[Any]) -> str:
+    labels = []
+    for document in documents or []:
+      metadata = getattr(document, 'metadata', None) or {}
+      content = ' '.join(getattr(document, 'page_content', '').split())[:DOCUMENT_LABEL_SIZE]
+      labels.append(f"{metadata.get('file', '')}: {content}".strip(': '))
+    return '\n'.join(labels)
+
+  def apply_digest(self) -> bool:
+    self.database_schema = self.routing_digest.text(CHAIN_TYPE.sql_chain)
+    self.open_api_schema = self.routing_digest.text(CHAIN_TYPE.open_api_chain)
+    self.documents = self.routing_digest.text(CHAIN_TYPE.vector_store_chain)
+    return self.find_chain(CHAIN_TYPE.vector_store_chain) is not None and not self.documents
 
   def build_knowledge(self, question: Optional[str]):
-    has_sql_chain = next((item for item in self.chains if item["name"] == CHAIN_TYPE.sql_chain), None)
-    has_open_api_chain = next((item for item in self.chains if item["name"] == CHAIN_TYPE.open_api_chain), None)
-    has_vector_store_chain = next((item for item in self.chains if item["name"] == CHAIN_TYPE.vector_store_chain), None)
-    if has_sql_chain:
-      self.database_schema = has_sql_chain['chain'].get_schema(None)
-    if has_open_api_chain:
-      schema = self.config.get('open_api')
-      self.open_api_schema = schema.get('data')
-    if has_vector_store_chain:
-      self.documents = has_vector_store_chain['chain'].build_relevant_docs(question)
+    if self.apply_digest():
+      documents = self.find_chain(CHAIN_TYPE.vector_store_chain)['chain'].build_relevant_docs(question, k=DOCUMENT_LABEL_COUNT)
+      self.documents = self.format_documents(documents)
 
-  def chain(self, input: Dict[str, Any]) -> Chain:
-    question = input['question']
-    self.build_knowledge(question)
-    prompt_chain = (
+  async def abuild_knowledge(self, question: Optional[str]):
+    if self.apply_digest():
+      documents = await self.find_chain(CHAIN_TYPE.vector_store_chain)['chain'].abuild_relevant_docs(question, k=DOCUMENT_LABEL_COUNT)
+      self.documents = self.format_documents(documents)
+
+  def routing_chain(self) -> RunnableSerializable[Any, Any]:
+    return (
       PromptTemplate.from_template(
         """Given the user question below, identify what's the better chain we can use to answer the question.
           To help identify, consider the following features about our chains:
             - open_api_chain - You are an AI with expertise in OpenAPI and Swagger.
-            - Based on the OpenAPI or Swagger schema below, this chain can be used to answer the question about these schema subjects.
+            - Based on the OpenAPI or Swagger operations below, this chain can be used to answer the question about these schema subjects.
             - {schema}
             - sql_chain - You are an AI with expertise in create SQL Sentences.
-            - Based on the table schema below, this chain can be used to answer the question about these schema subjects.
+            - Based on the tables and columns below, this chain can be used to answer the question about these schema subjects.
             - {database_schema}
             - vector_store_chain - You are an AI with expertise in document analysis.
-            - Based on the documents below, this chain can be used to answer the question about these document subjects.
+            - Based on the document topics below, this chain can be used to answer the question about these document subjects.
             - {documents}
             - simple_chain - You are an AI with general knowledge.
           Do not respond with more than one word.\n
@@ -70,15 +151,42 @@ class OrchestratorChain(Chain):
         | self.model
         | StrOutputParser()
       )
-    response = prompt_chain.invoke({"question": question, "database_schema": self.database_schema, "schema": self.open_api_schema, "documents": self.documents})
+
+  def routing_input(self, question: str) -> Dict[str, Any]:
+    return {"question": question, "database_schema": self.database_schema, "schema": self.open_api_schema, "documents": self.documents}
+
+  def select_chain(self, response: str) -> Chain:
     final_chain = next(item for item in self.chains if item["name"] == CHAIN_TYPE[response.strip()])
     return final_chain['chain']
 
+  def chain(self, input: Dict[str, Any]) -> Chain:
+    question = input['question']
+    chain = self.pre_route(question)
+    if chain is not None:
+      return chain
+    self.build_knowledge(question)
+    response = self.routing_chain().invoke(self.routing_input(question))
+    return self.select_chain(response)
+
+  async def achain(self, input: Dict[str, Any]) -> Chain:
+    question = input['question']
+    chain = await run_in_executor(self.pre_route, question)
+    if chain is not None:
+      return chain
+    await self.abuild_knowledge(question)
+    response = await self.routing_chain().ainvoke(self.routing_input(question))
+    return self.select_chain(response)
+
   async def _call(self, input: Dict[str, Any]):
-    chain = self.chain(input)
+    chain = await self.achain(input)
     response = await chain._call(input)
     return response
 
+  async def _astream(self, input: Dict[str, Any]) -> AsyncIterator[str]:
+    chain = await self.achain(input)
+    async for token in chain._astream(input):
+      yield token
+
   @property
   def _chain_type(self) -> str:
     return "orchestrator_chain"
@@ -0,0 +1,139 @@
+import hashlib
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ai_enterprise_agent.interface.settings import CHAIN_TYPE, IRouter
+from ai_enterprise_agent.utils.text_helper import tokenize
+
+DEFAULT_MARGIN = 0.2
+DEFAULT_MIN_SCORE = 0.3
+MAX_DIGEST_TITLES = 50
+MAX_DIGEST_TITLES_LENGTH = 2000
+
+class KeywordRouter:
+  """
+  Local routing stage for the orchestrator.
+
+  Each chain gets a bag of domain terms (table and column names, OpenAPI paths
+  and summaries, document titles, configured keywords). A question is scored
+  against every domain with IDF-weighted term coverage, and a chain is picked
+  only when the best score clears min_score and beats the runner-up by
+  margin. Otherwise None is returned and the LLM router decides.
+  """
+
+  def __init__(self, margin: float = DEFAULT_MARGIN, min_score: float = DEFAULT_MIN_SCORE) -> None:
+    self.margin = margin
+    self.min_score = min_score
+    self.domains: Dict[CHAIN_TYPE, set] = {}
+    self.idf: Dict[str, float] = {}
+    self.indexed = False
+    self.lock = threading.Lock()
+
+  @staticmethod
+  def from_config(config: Optional[IRouter]) -> Optional['KeywordRouter']:
+    if not config or not config.get('enabled', True):
+      return None
+    return KeywordRouter(
+      margin=DEFAULT_MARGIN if config.get('margin') is None else config.get('margin'),
+      min_score=DEFAULT_MIN_SCORE if config.get('min_score') is None else config.get('min_score'),
+    )
+
+  def index(self, domains: Dict[CHAIN_TYPE, Iterable[str]]) -> None:
+    terms = {name: set(token for text in texts for token in tokenize(text)) for name, texts in domains.items()}
+    total = max(len(terms), 1)
+    frequency: Dict[str, int] = {}
+    for tokens in terms.values():
+      for token in tokens:
+        frequency[token] = frequency.get(token, 0) + 1
+    with self.lock:
+      self.domains = terms
+      self.idf = {token: math.log(1 + total / count) for token, count in frequency.items()}
+      self.indexed = True
+
+  def score(self, question: str) -> List[Tuple[CHAIN_TYPE, float]]:
+    tokens = set(tokenize(question))
+    if not tokens or not self.domains:
+      return []
+    unknown = math.log(1 + max(len(self.domains), 1))
+    total = sum(self.idf.get(token, unknown) for token in tokens)
+    scores = [
+      (name, sum(self.idf[token] for token in tokens & terms) / total)
+      for name, terms in self.domains.items()
+    ]
+    return sorted(scores, key=lambda item: item[1], reverse=True)
+
+  def route(self, question: str) -> Optional[CHAIN_TYPE]:
+    scores = self.score(question)
+    if not scores:
+      return None
+    best_name, best = scores[0]
+    runner_up = scores[1][1] if len(scores) > 1 else 0.0
+    if best >= self.min_score and best - runner_up >= self.margin:
+      return best_name
+    return None
+
+
+class RoutingDigest:
+  """
+  Compact, cached description of each chain's domain used as routing context:
+  table and column names, operation ids and summaries, document topic labels.
+
+  Every section remembers the fingerprint of the source it was built from and
+  is rebuilt only when that fingerprint changes.
+  """
+
+  def __init__(self) -> None:
+    self.sections: Dict[CHAIN_TYPE, Tuple[str, List[str]]] = {}
+    self.fingerprints: Dict[CHAIN_TYPE, str] = {}
+    self.lock = threading.Lock()
+
+  @staticmethod
+  def fingerprint(source: Any) -> str:
+    return hashlib.sha1(str(source).encode('utf-8')).hexdigest()
+
+  def update(self, name: CHAIN_TYPE, source: Any, build: Callable[[], Tuple[str, List[str]]]) -> bool:
+    fingerprint = self.fingerprint(source)
+    if self.fingerprints.get(name) == fingerprint:
+      return False
+    section = build()
+    with self.lock:
+      self.sections[name] = section
+      self.fingerprints[name] = fingerprint
+    return True
+
+  def text(self, name: CHAIN_TYPE) -> Optional[str]:
+    section = self.sections.get(name)
+    return section[0] if section else None
+
+  def terms(self, name: CHAIN_TYPE) -> List[str]:
+    section = self.sections.get(name)
+    return section[1] if section else []
+
+  @staticmethod
+  def from_tables(tables: Dict[str, List[str]]) -> Tuple[str, List[str]]:
+    text = '\n'.join(f"{table}({', '.join(columns)})" for table, columns in tables.items())
+    terms = [term for table, columns in tables.items() for term in [table] + columns]
+    return text, terms
+
+  @staticmethod
+  def from_operations(operations: List[Dict[str, Any]]) -> Tuple[str, List[str]]:
+    lines, terms = [], []
+    for operation in operations:
+      operation_id = operation.get('operation_id') or ''
+      lines.append(f"{operation['method']} {operation['path']} {operation_id}: {operation.get('summary', '')}".strip())
+      terms.extend([operation['path'], operation_id, operation.get('summary', '')] + operation.get('tags', []))
+    return '\n'.join(lines), terms
+
+  @staticmethod
+  def from_titles(titles: List[str]) -> Tuple[str, List[str]]:
+    """
+    Document titles as routing context. A corpus with more titles than fit
+    in MAX_DIGEST_TITLES and MAX_DIGEST_TITLES_LENGTH gets no text, so the
+    orchestrator falls back to the labels of the top-k documents; every
+    title is still a keyword router term.
+    """
+    text = ', '.join(titles)
+    if len(titles) > MAX_DIGEST_TITLES or len(text) > MAX_DIGEST_TITLES_LENGTH:
+      text = ''
+    return text, titles
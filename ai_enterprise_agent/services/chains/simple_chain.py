@@ -1,5 +1,5 @@
 from operator import itemgetter
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 
 from langchain.chains.base import Chain
 from langchain.prompts import ChatPromptTemplate
@@ -49,15 +49,20 @@ class SimpleChain(Chain):
   def chain(self) -> RunnableSerializable[Any, Any]:
     settings = self.config.get('system')
     prompt = ChatPromptTemplate.from_template(self.build_system_messages(settings.get('system_message')))
-    return  RunnablePassthrough.assign(history=RunnableLambda(self.memory.get_messages()) | itemgetter("history")) | prompt | self.model | StrOutputParser()
+    return  RunnablePassthrough.assign(history=RunnableLambda(self.memory.get_messages(), afunc=self.memory.aget_messages()) | itemgetter("history")) | prompt | self.model | StrOutputParser()
 
   async def _call(self, input: Dict[str, Any]):
     chain = self.chain()
-    response = chain.invoke(input)
+    response = await chain.ainvoke(input)
     if self.config.get('processing_type') == PROCESSING_TYPE.sequential:
       return  { self.output_key: response }
     return response
 
+  async def _astream(self, input: Dict[str, Any]) -> AsyncIterator[str]:
+    chain = self.chain()
+    async for token in chain.astream(input):
+      yield token
+
   @property
   def _chain_type(self) -> str:
     return "simple_chain"
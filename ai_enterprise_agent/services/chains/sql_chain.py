@@ -1,6 +1,8 @@
 import re
+import threading
+import time
 from operator import itemgetter
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain.chains.base import Chain
 from langchain.prompts import ChatPromptTemplate
@@ -14,6 +16,13 @@ from sqlalchemy import URL
 from ai_enterprise_agent.interface.chat_history import IChatHistoryService
 from ai_enterprise_agent.interface.settings import (DIALECT_TYPE,
                                                     PROCESSING_TYPE, ISettings)
+from ai_enterprise_agent.utils.database_helper import EngineRegistry
+
+DEFAULT_SCHEMA_TTL = 300
+
+_schema_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, str]] = {}
+_schema_locks: Dict[Tuple[str, Tuple[str, ...]], threading.Lock] = {}
+_schema_lock = threading.Lock()
 
 
 class SqlChain(Chain):
@@ -38,7 +47,17 @@ class SqlChain(Chain):
     self.model = model
     self.memory = memory
     self.config = config
-    self.db = SQLDatabase.from_uri(database_uri=self.build_uri_connect())
+    self.db = EngineRegistry.get_database(self.build_uri_connect(), **self.pool_options())
+
+  def pool_options(self) -> Dict[str, Any]:
+    database = self.config.get('database')
+    return {
+      'pool_size': database.get('pool_size'),
+      'max_overflow': database.get('max_overflow'),
+      'pool_pre_ping': database.get('pool_pre_ping'),
+      'pool_recycle': database.get('pool_recycle'),
+      'pool_timeout': database.get('pool_timeout'),
+    }
 
   def build_uri_connect(self) -> str:
     config = self.config
@@ -49,19 +68,88 @@ class SqlChain(Chain):
         username=database.get('username'),
         password=database.get('password'),
         host=database.get('host'),
+        port=int(database.get('port')) if database.get('port') else None,
         database=database.get('database'),
       )
     else:
       raise Exception("Invalid database connection")
 
-  def get_schema(self, _):
-    config = self.config
-    database = config.get('database')
+  def include_tables(self) -> Optional[List[str]]:
+    """
+    The includes_tables setting as table names: a comma-separated string,
+    or a list taken as is. None means every table.
+    """
+    tables = self.config.get('database').get('includes_tables')
+    if isinstance(tables, str):
+      tables = tables.split(',')
+    tables = [table.strip() for table in tables or [] if table and table.strip()]
+    return tables or None
+
+  def schema_cache_key(self) -> Tuple[str, Tuple[str, ...]]:
+    url = EngineRegistry.build_key(self.build_uri_connect())
+    return (url, tuple(sorted(self.include_tables() or ())))
+
+  def schema_ttl(self) -> int:
+    database = self.config.get('database')
+    ttl = database.get('schema_ttl')
+    return DEFAULT_SCHEMA_TTL if ttl is None else ttl
+
+  def refresh_schema(self) -> Optional[str]:
+    """
+    Drop the cached schema of this connection and introspect it again.
+    """
+    with _schema_lock:
+      _schema_cache.pop(self.schema_cache_key(), None)
+    return self.get_schema(None)
+
+  def load_schema(self) -> Optional[str]:
     try:
-      return self.db.get_table_info(database.get('includes_tables'))
+      return self.db.get_table_info(self.include_tables())
     except Exception as e:
       print(f"Error executing query: {e}")
 
+  def get_schema(self, input: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    if isinstance(input, dict) and input.get('schema'):
+      return input['schema']
+
+    ttl = self.schema_ttl()
+    if ttl <= 0:
+      return self.load_schema()
+
+    key = self.schema_cache_key()
+    cached = _schema_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+      return cached[1]
+
+    with _schema_lock:
+      lock = _schema_locks.setdefault(key, threading.Lock())
+
+    with lock:
+      cached = _schema_cache.get(key)
+      if cached and cached[0] > time.monotonic():
+        return cached[1]
+      schema = self.load_schema()
+      if schema is not None:
+        _schema_cache[key] = (time.monotonic() + ttl, schema)
+      return schema
+
+  def get_tables(self, schema: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Return table names and their columns parsed from the cached schema, so
+    callers get a compact view without another round trip to the database.
+    """
+    schema = schema if schema is not None else self.get_schema(None)
+    tables: Dict[str, List[str]] = {}
+    for name, body in re.findall(r'CREATE TABLE\s+"?([\w\.]+)"?\s*\((.*?)\n\)', schema or '', re.DOTALL):
+      columns = []
+      for line in body.split('\n'):
+        line = line.strip()
+        if not line or line.split(' ')[0].upper() in ('CONSTRAINT', 'PRIMARY', 'FOREIGN', 'UNIQUE', 'CHECK'):
+          continue
+        columns.append(line.split(' ')[0].strip('"'))
+      tables[name] = columns
+    return tables
+
   def run_query(self, query):
     try:
       return self.db.run(query)
@@ -81,7 +169,7 @@ class SqlChain(Chain):
     SQL Query:"""
     prompt = ChatPromptTemplate.from_template(template)
     return (
-      RunnablePassthrough.assign(history=RunnableLambda(self.memory.get_messages()) | itemgetter("history"))
+      RunnablePassthrough.assign(history=RunnableLambda(self.memory.get_messages(), afunc=self.memory.aget_messages()) | itemgetter("history"))
         .assign(schema=self.get_schema)
       | prompt
       | self.model.bind(stop=["\nSQLResult:"])
@@ -119,7 +207,7 @@ class SqlChain(Chain):
     prompt = ChatPromptTemplate.from_template(template)
     try:
       chain = (
-        RunnablePassthrough.assign(history=RunnableLambda(self.memory.get_messages()) | itemgetter("history"))
+        RunnablePassthrough.assign(history=RunnableLambda(self.memory.get_messages(), afunc=self.memory.aget_messages()) | itemgetter("history"))
           .assign(custom_system_message=lambda _: custom_system_message)
           .assign(schema=self.get_schema)
           .assign(query=self.create_sql)
@@ -133,11 +221,17 @@ class SqlChain(Chain):
   async def _call(self, input: Dict[str, Any] = None):
     custom_system_message = input.get('custom_system_message', None)
     chain = self.chain(custom_system_message)
-    response = chain.invoke(input)
+    response = await chain.ainvoke(input)
     if self.config.get('processing_type') == PROCESSING_TYPE.sequential:
       return { self.output_key: response }
     return response
 
+  async def _astream(self, input: Dict[str, Any]) -> AsyncIterator[str]:
+    custom_system_message = input.get('custom_system_message', None)
+    chain = self.chain(custom_system_message)
+    async for token in chain.astream(input):
+      yield token
+
   @property
   def _chain_type(self) -> str:
     return "sql_chain"
@@ -1,14 +1,16 @@
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain.chains.base import Chain
 from langchain.prompts import PromptTemplate
+from langchain_core.documents import Document
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langchain_core.vectorstores import VectorStore
 
 from ai_enterprise_agent.interface.chat_history import IChatHistoryService
 from ai_enterprise_agent.interface.settings import PROCESSING_TYPE, ISettings
+from ai_enterprise_agent.services.cache.retrieval_cache import RetrievalCache
 from ai_enterprise_agent.services.vector_store.vector_store import \
     VectorStoreFactory
 
@@ -21,6 +23,7 @@ class VectorStoreChain(Chain):
   model: BaseChatModel = None
   config: ISettings = None
   vector_store: VectorStore = None
+  retrieval_cache: Optional[RetrievalCache] = None
 
   @property
   def input_keys(self):
@@ -36,13 +39,42 @@ class VectorStoreChain(Chain):
     self.memory = memory
     self.config = config
     self.vector_store = VectorStoreFactory.build(config=config, model=self.model)
+    self.retrieval_cache = RetrievalCache.for_index(config.get('vector_store'))
+
+  def lookup_relevant_docs(self, query: str, k: int) -> Tuple[Optional[str], Optional[List[Document]]]:
+    cache = self.retrieval_cache
+    if cache is None:
+      return None, None
+    key = cache.build_key(query, k, self.config.get('vector_store').get('custom_filters', None))
+    return key, cache.get(key)
+
+  def update_relevant_docs(self, key: Optional[str], documents: List[Document]) -> None:
+    if self.retrieval_cache is not None and key is not None:
+      self.retrieval_cache.set(key, documents)
 
   def build_relevant_docs(self, query: str, k: int = 10):
-    config = self.config.get('vector_store')
-    return self.vector_store.similarity_search(query=query, k=k, filters=config.get('custom_filters', None))
+    key, documents = self.lookup_relevant_docs(query, k)
+    if documents is None:
+      filters = self.config.get('vector_store').get('custom_filters', None)
+      documents = self.vector_store.similarity_search(query=query, k=k, filters=filters)
+      self.update_relevant_docs(key, documents)
+    return documents
+
+  async def abuild_relevant_docs(self, query: str, k: int = 10):
+    key, documents = self.lookup_relevant_docs(query, k)
+    if documents is None:
+      filters = self.config.get('vector_store').get('custom_filters', None)
+      documents = await self.vector_store.asimilarity_search(query=query, k=k, filters=filters)
+      self.update_relevant_docs(key, documents)
+    return documents
 
-  def chain(self, query: str):
-    context = self.build_relevant_docs(query)
+  def get_context(self, input: Dict[str, Any]):
+    return self.build_relevant_docs(input.get('question'))
+
+  async def aget_context(self, input: Dict[str, Any]):
+    return await self.abuild_relevant_docs(input.get('question'))
+
+  def chain(self):
     template = """Use the following the context to answer the question at the end.
     If you don't know the answer, just say that you don't know, don't try to make up an answer.
     {context}
@@ -50,7 +82,7 @@ class VectorStoreChain(Chain):
     Answer:"""
     prompt = PromptTemplate.from_template(template)
     return (
-      RunnablePassthrough.assign(context=lambda _: context)
+      RunnablePassthrough.assign(context=RunnableLambda(self.get_context, afunc=self.aget_context))
       | prompt
       | self.model
       | StrOutputParser()
@@ -58,8 +90,13 @@ class VectorStoreChain(Chain):
 
   async def _call(self, input: Dict[str, Any]):
     question = input.get('question')
-    chain = self.chain(question)
-    response = chain.invoke(input={"question": question})
+    chain = self.chain()
+    response = await chain.ainvoke(input={"question": question})
     if self.config.get('processing_type') == PROCESSING_TYPE.sequential:
       return { self.output_key: response }
     return response
+
+  async def _astream(self, input: Dict[str, Any]) -> AsyncIterator[str]:
+    chain = self.chain()
+    async for token in chain.astream(input={"question": input.get('question')}):
+      yield token
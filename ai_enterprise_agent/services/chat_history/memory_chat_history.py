@@ -1,4 +1,4 @@
-from typing import List, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.memory.chat_memory import ChatMessageHistory
@@ -52,4 +52,16 @@ class MemoryChatHistory(BaseChatMessageHistory, IChatHistoryService):
     def clear(self):
         self.memory.clear()
 
+    async def aadd_messages(self, messages: Sequence[BaseMessage]) -> None:
+        self.add_messages(messages)
+
+    async def aload_memory_variables(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.memory.load_memory_variables(inputs)
+
+    def aget_messages(self):
+        return self.aload_memory_variables
+
+    async def aclear(self):
+        self.clear()
+
 
@@ -1,20 +1,29 @@
+import json
 from typing import Any, Dict, List, Optional, Sequence
 
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.schema import BaseChatMessageHistory
-from langchain_community.chat_message_histories.redis import \
-    RedisChatMessageHistory
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.messages import (AIMessage, BaseMessage, HumanMessage,
+                                     message_to_dict, messages_from_dict)
 from nanoid import generate
+from redis import Redis
 
 from ai_enterprise_agent.interface.chat_history import IChatHistoryService
 from ai_enterprise_agent.interface.settings import IChatHistory
+from ai_enterprise_agent.utils.redis_helper import RedisRegistry
+
+KEY_PREFIX = 'history'
 
 
 class MemoryChatRedis(BaseChatMessageHistory, IChatHistoryService):
+  """
+  Per-session view over the shared Redis pool. Building one opens no
+  connection; messages live in the list '<KEY_PREFIX><session_id>', newest
+  first, the layout RedisChatMessageHistory uses. The async methods go
+  through the redis.asyncio pool of the running event loop.
+  """
 
   memory_key: str = "history"
-  chat_history: IChatHistory = None
 
   @property
   def memory_variables(self) -> List[str]:
@@ -23,62 +32,92 @@ class MemoryChatRedis(BaseChatMessageHistory, IChatHistoryService):
   def __init__(self, config: IChatHistory, session_id: str):
     super().__init__()
     self.config = config
-    self.session_id = session_id
-    self.chat_history = self.get_client()
+    self.session_id = session_id or generate()
+    self.key = f"{KEY_PREFIX}{self.session_id}"
+    self.client = self.get_client()
     self.memory = ConversationBufferWindowMemory(
-        return_messages=True,
-        memory_key='history',
-        chat_memory=self.chat_history,
-        k=config.get('limit')
-    )
-
-  def get_client(self) -> RedisChatMessageHistory:
-    if self.chat_history:
-      return self.chat_history
-
-    config = self.config
-    url = f"redis://:{config.get('password')}@{config.get('host')}:{int(config.get('port'))}/{int(config.get('database',0))}"
-    chat_memory = RedisChatMessageHistory(
-      session_id=self.session_id or generate(),
-      ttl=config.get('session_ttl'),
-      key_prefix='history',
-      url=url
+      return_messages=True,
+      memory_key='history',
+      chat_memory=self,
+      k=config.get('limit')
     )
 
-    return chat_memory
+  def get_client(self) -> Redis:
+    return RedisRegistry.get_client(self.config)
 
   def get_memory(self):
-        return self.memory
+    return self.memory
+
+  @property
+  def messages(self) -> List[BaseMessage]:
+    return self.load_memory_variables(None)[self.memory_key]
 
   def add_user_message(self, message: str):
-      if isinstance(message, HumanMessage):
-          self.add_message(message)
-      else:
-          self.add_message(HumanMessage(content=message))
+    if isinstance(message, HumanMessage):
+      self.add_message(message)
+    else:
+      self.add_message(HumanMessage(content=message))
 
   def add_ai_message(self, message: str):
-      if isinstance(message, AIMessage):
-          self.add_message(message)
-      else:
-          self.add_message(AIMessage(content=message))
+    if isinstance(message, AIMessage):
+      self.add_message(message)
+    else:
+      self.add_message(AIMessage(content=message))
 
   def add_message(self, message: BaseMessage) -> None:
-    if type(self).add_messages != BaseChatMessageHistory.add_messages:
-        self.chat_history.add_message(message)
-    else:
-        raise NotImplementedError(
-            "add_message is not implemented for this class. "
-            "Please implement add_message or add_messages."
-        )
+    self.add_messages([message])
 
   def add_messages(self, messages: Sequence[BaseMessage]) -> None:
-    pass
+    """
+    Append the messages and refresh the session TTL in a single round trip.
+    """
+    if not messages:
+      return
+    pipeline = self.client.pipeline(transaction=False)
+    for message in messages:
+      pipeline.lpush(self.key, json.dumps(message_to_dict(message)))
+    if self.config.get('session_ttl'):
+      pipeline.expire(self.key, self.config.get('session_ttl'))
+    pipeline.execute()
+
+  def window(self) -> int:
+    """
+    Number of messages read back: `limit` exchanges of a question and an
+    answer, the same window ConversationBufferWindowMemory keeps.
+    """
+    limit = self.config.get('limit')
+    return limit * 2 if limit else 0
 
   def load_memory_variables(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-    return { self.memory_key: self.chat_history.messages }
+    items = self.client.lrange(self.key, 0, self.window() - 1)
+    messages = messages_from_dict([json.loads(item) for item in reversed(items)])
+    return { self.memory_key: messages }
 
   def get_messages(self):
     return self.load_memory_variables
 
   def clear(self):
-    pass
+    self.client.delete(self.key)
+
+  async def aadd_messages(self, messages: Sequence[BaseMessage]) -> None:
+    if not messages:
+      return
+    client = RedisRegistry.get_async_client(self.config)
+    async with client.pipeline(transaction=False) as pipeline:
+      for message in messages:
+        pipeline.lpush(self.key, json.dumps(message_to_dict(message)))
+      if self.config.get('session_ttl'):
+        pipeline.expire(self.key, self.config.get('session_ttl'))
+      await pipeline.execute()
+
+  async def aload_memory_variables(self, inputs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    client = RedisRegistry.get_async_client(self.config)
+    items = await client.lrange(self.key, 0, self.window() - 1)
+    messages = messages_from_dict([json.loads(item) for item in reversed(items)])
+    return { self.memory_key: messages }
+
+  def aget_messages(self):
+    return self.aload_memory_variables
+
+  async def aclear(self):
+    await RedisRegistry.get_async_client(self.config).delete(self.key)
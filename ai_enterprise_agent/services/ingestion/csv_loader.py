@@ -1,13 +1,16 @@
+import csv
 import traceback
-from typing import List
+from typing import Iterator, List, Optional
 
-from langchain_community.document_loaders.csv_loader import CSVLoader
+from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore
 
 from ai_enterprise_agent.interface.settings import ISettings
 
-from .loader import Loader
+from .loader import IngestionPipeline, Loader, ProgressCallback
+from .manifest import IndexManifest
+from .splitter import TokenSplitter
 
 
 class CsvLoader():
@@ -15,25 +18,23 @@ class CsvLoader():
     resource = Loader.build(config)
     self.vector_store: VectorStore = resource.get('vector_store')
     self.embeddings: Embeddings = resource.get('embeddings')
+    self.pipeline: IngestionPipeline = resource.get('pipeline')
+    self.splitter = TokenSplitter.from_config(config.get('ingestion'))
 
-  async def load_file(self, file: str, file_name: str, chat_uid='global', tags:str = None) -> List[str]:
+  async def load_file(self, file: str, file_name: str, chat_uid='global', tags:str = None, on_progress: Optional[ProgressCallback] = None) -> List[str]:
     try:
       documents = self.split_file(file)
-      indexed_documents = Loader.index_documents(file_name, documents, chat_uid, tags, embeddings=self.embeddings)
-      documents = self.vector_store.add_documents(documents=indexed_documents)
-      return documents
+      indexed_documents = Loader.iter_index_documents(file_name, documents, chat_uid, tags)
+      return await self.pipeline.sync(IndexManifest.build_key(chat_uid, file_name), indexed_documents, on_progress=on_progress)
     except Exception as e:
       print(f'Error while loading file: {e}')
       traceback.print_exc()
       return []
 
-  def split_file(self, file_content: str) -> List[str]:
-    try:
-      loader = CSVLoader(file_content)
-      docs = loader.load()
-    except Exception as e:
-      traceback.print_exc()
-      print('Error Exception: ', e)
-      return e
+  def read_rows(self, file_path: str) -> Iterator[str]:
+    with open(file_path, newline='', encoding='utf-8-sig', errors='ignore') as f:
+      for row in csv.DictReader(f):
+        yield "\n".join(f"{str(k).strip()}: {str(v).strip() if v is not None else ''}" for k, v in row.items()) + "\n\n"
 
-    return docs
+  def split_file(self, file_path: str) -> Iterator[Document]:
+    return self.splitter.split(self.read_rows(file_path), metadata={'source': file_path})
@@ -1,17 +1,37 @@
+import asyncio
 import hashlib
+import random
 import tempfile
-from typing import List, Optional
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
-from nanoid import generate
 
-from ai_enterprise_agent.interface.settings import ISettings
+from ai_enterprise_agent.interface.settings import (VECTOR_STORE_TYPE,
+                                                    IIngestion, ISettings)
+from ai_enterprise_agent.services.cache.retrieval_cache import RetrievalCache
 from ai_enterprise_agent.services.llm.model import ModelFactory
 from ai_enterprise_agent.services.vector_store.embedding import \
     EmbeddingFactory
 from ai_enterprise_agent.services.vector_store.vector_store import \
     VectorStoreFactory
+from ai_enterprise_agent.utils.executor_helper import run_in_executor
+
+from .manifest import IndexManifest
+
+BATCH_LIMITS = {
+  VECTOR_STORE_TYPE.azure_search: 1000,
+  VECTOR_STORE_TYPE.open_search: 500,
+  VECTOR_STORE_TYPE.pinecone: 100,
+  VECTOR_STORE_TYPE.local: 1000,
+}
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 1.0
+
+ProgressCallback = Callable[[int, Optional[int]], Any]
 
 
 class CustomDocument(Document):
@@ -29,20 +49,31 @@ class Loader:
     model = ModelFactory.build(llm_config)
     vector_store = VectorStoreFactory.build(config, model)
     embeddings = EmbeddingFactory.build(vector_store_config.get('type'), config)
-    return {'vector_store': vector_store, 'embeddings': embeddings }
+    pipeline = IngestionPipeline(vector_store, config)
+    return {'vector_store': vector_store, 'embeddings': embeddings, 'pipeline': pipeline }
 
   @staticmethod
   def index_documents(file_name: str, documents: List[Document], chat_uid: str, tags: str, embeddings: Embeddings) -> List[CustomDocument]:
+    return list(Loader.iter_index_documents(file_name, documents, chat_uid, tags))
+
+  @staticmethod
+  def iter_index_documents(file_name: str, documents: Iterable[Document], chat_uid: str, tags: str) -> Iterator[CustomDocument]:
     hashed_user_id = Loader.hash_user_id()
-    return [CustomDocument(
-      id=str(generate()),
-      chat_thread_id=chat_uid,
-      user=hashed_user_id,
-      tags=tags,
-      page_content=f"Header\nFilename:{file_name}\n{doc.page_content}",
-      metadata={"file": file_name, "tags": tags},
-      embedding=[],
-    ) for doc in documents]
+    for doc in documents:
+      yield CustomDocument(
+        id=Loader.build_document_id(file_name, doc.page_content, chat_uid),
+        chat_thread_id=chat_uid,
+        user=hashed_user_id,
+        tags=tags,
+        page_content=f"Header\nFilename:{file_name}\n{doc.page_content}",
+        metadata={"file": file_name, "tags": tags},
+        embedding=[],
+      )
+
+  @staticmethod
+  def build_document_id(file_name: str, content: str, chat_uid: str = 'global') -> str:
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    return hashlib.sha256(f"{chat_uid}\n{file_name}\n{content_hash}".encode('utf-8')).hexdigest()
 
   @staticmethod
   def hash_user_id() -> str:
@@ -56,3 +87,140 @@ class Loader:
       temp_file_path = temp_file.name
 
     return temp_file_path
+
+
+class IngestionPipeline:
+  """
+  Splits documents into batches and upserts them into the vector store with
+  bounded concurrency, retrying failed batches with jittered backoff.
+
+  Each batch goes through the store's aadd_documents, which embeds and
+  upserts it without blocking the event loop and respects the provider limits.
+  Stores that buffer writes (the local index) are flushed once per run.
+  """
+
+  def __init__(self, vector_store: Any, config: ISettings) -> None:
+    ingestion: IIngestion = config.get('ingestion') or {}
+    store_type = (config.get('vector_store') or {}).get('type')
+    limit = BATCH_LIMITS.get(store_type, DEFAULT_BATCH_SIZE)
+    self.vector_store = vector_store
+    self.vector_store_config = config.get('vector_store') or {}
+    self.batch_size = max(1, min(ingestion.get('batch_size') or limit, limit))
+    self.max_concurrency = max(1, ingestion.get('max_concurrency') or DEFAULT_MAX_CONCURRENCY)
+    self.max_retries = DEFAULT_MAX_RETRIES if ingestion.get('max_retries') is None else ingestion.get('max_retries')
+    self.retry_backoff = DEFAULT_RETRY_BACKOFF if ingestion.get('retry_backoff') is None else ingestion.get('retry_backoff')
+    self.manifest = None
+    if ingestion.get('incremental', True):
+      self.manifest = IndexManifest.for_index(self.vector_store_config, ingestion.get('manifest_dir'))
+
+  def batches(self, documents: Iterable[Document]) -> Iterator[List[Document]]:
+    iterator = iter(documents)
+    while True:
+      batch = list(islice(iterator, self.batch_size))
+      if not batch:
+        return
+      yield batch
+
+  async def upsert(self, batch: List[Document]) -> List[str]:
+    attempt = 0
+    while True:
+      try:
+        ids = await self.vector_store.aadd_documents(batch)
+        RetrievalCache.invalidate(self.vector_store_config)
+        return ids or []
+      except Exception as e:
+        if attempt >= self.max_retries:
+          raise e
+        delay = self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+        print(f'Error while upserting batch, retrying in {delay:.2f}s: {e}')
+        attempt += 1
+        await asyncio.sleep(delay)
+
+  async def flush(self) -> None:
+    flush = getattr(self.vector_store, 'flush', None)
+    if flush is not None:
+      await run_in_executor(flush)
+
+  async def run(self, documents: Iterable[Document], on_progress: Optional[ProgressCallback] = None) -> List[str]:
+    """
+    Ingest the documents and return the ids reported by the vector store.
+
+    Args:
+        documents (Iterable[Document]): The documents, consumed lazily batch by batch.
+        on_progress (Callable[[int, Optional[int]], Any]): Called with the number of
+          documents ingested so far and the total, when it is known.
+    """
+    ids = await self.ingest(documents, on_progress)
+    await self.flush()
+    return ids
+
+  async def ingest(self, documents: Iterable[Document], on_progress: Optional[ProgressCallback] = None) -> List[str]:
+    total = len(documents) if hasattr(documents, '__len__') else None
+    semaphore = asyncio.Semaphore(self.max_concurrency)
+    done = 0
+
+    async def process(batch: List[Document]) -> List[str]:
+      nonlocal done
+      try:
+        ids = await self.upsert(batch)
+      finally:
+        semaphore.release()
+      done += len(batch)
+      if on_progress:
+        on_progress(done, total)
+      return ids
+
+    batches = self.batches(documents)
+    tasks: List[asyncio.Task] = []
+    try:
+      while True:
+        await semaphore.acquire()
+        batch = await run_in_executor(next, batches, None)
+        if batch is None:
+          semaphore.release()
+          break
+        tasks.append(asyncio.create_task(process(batch)))
+      results = await asyncio.gather(*tasks)
+    except Exception:
+      for task in tasks:
+        task.cancel()
+      raise
+
+    return [id for ids in results for id in ids]
+
+  async def sync(self, key: str, documents: Iterable[Document], on_progress: Optional[ProgressCallback] = None) -> List[str]:
+    """
+    Incrementally re-ingest one source: only chunks whose id is not in the
+    manifest are embedded and upserted, and chunks of the previous version
+    that are no longer present are deleted from the vector store.
+
+    Args:
+        key (str): The manifest key of the source, see IndexManifest.build_key.
+        documents (Iterable[Document]): The indexed chunks with deterministic ids.
+        on_progress (Callable[[int, Optional[int]], Any]): Progress callback for the upserts.
+
+    Returns:
+        List[str]: The ids of the chunks that were upserted.
+    """
+    if self.manifest is None:
+      return await self.run(documents, on_progress=on_progress)
+
+    previous = await run_in_executor(self.manifest.get, key)
+    seen = set()
+
+    def changed() -> Iterator[Document]:
+      for document in documents:
+        if document.id in seen:
+          continue
+        seen.add(document.id)
+        if document.id not in previous:
+          yield document
+
+    ids = await self.ingest(changed(), on_progress=on_progress)
+    removed = previous - seen
+    if removed:
+      await self.vector_store.adelete(ids=list(removed))
+      RetrievalCache.invalidate(self.vector_store_config)
+    await self.flush()
+    await run_in_executor(self.manifest.update, key, seen)
+    return ids
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+DEFAULT_MANIFEST_DIR = os.path.join(os.path.expanduser('~'), '.ai_enterprise_agent', 'manifests')
+
+
+class IndexManifest:
+  """
+  Local record of the chunk ids already indexed for each source file.
+
+  The manifest is a JSON file per vector index (store type, endpoint or
+  path, and index name) mapping a source key
+  (chat thread and file name) to the ids of its chunks, which lets
+  re-ingestion skip unchanged chunks and delete the ones that disappeared.
+  """
+
+  _lock = threading.Lock()
+
+  def __init__(self, path: str) -> None:
+    self.path = path
+    self.entries: Optional[Dict[str, List[str]]] = None
+
+  @staticmethod
+  def for_index(vector_store_config: Dict[str, Any], directory: Optional[str] = None) -> 'IndexManifest':
+    """
+    Return the manifest of the configured index. An index with the same name
+    on another store type, endpoint or local path gets its own file.
+    """
+    store_type = vector_store_config.get('type')
+    location = vector_store_config.get('endpoint') or vector_store_config.get('path') or ''
+    digest = hashlib.sha256(f"{getattr(store_type, 'value', store_type)}|{location}".encode('utf-8')).hexdigest()[:16]
+    file_name = f"{vector_store_config.get('index_name') or 'default'}-{digest}.json"
+    return IndexManifest(os.path.join(directory or DEFAULT_MANIFEST_DIR, file_name))
+
+  @staticmethod
+  def build_key(chat_uid: str, file_name: str) -> str:
+    return f"{chat_uid}/{file_name}"
+
+  def load(self) -> Dict[str, List[str]]:
+    if self.entries is not None:
+      return self.entries
+    try:
+      with open(self.path, 'r', encoding='utf-8') as f:
+        self.entries = json.load(f)
+    except FileNotFoundError:
+      self.entries = {}
+    except (OSError, json.JSONDecodeError) as e:
+      print(f'Error reading manifest {self.path}: {e}')
+      self.entries = {}
+    return self.entries
+
+  def get(self, key: str) -> Set[str]:
+    return set(self.load().get(key, []))
+
+  def keys(self) -> List[str]:
+    return list(self.load().keys())
+
+  def modified_at(self) -> float:
+    try:
+      return os.path.getmtime(self.path)
+    except OSError:
+      return 0.0
+
+  def update(self, key: str, ids: Set[str]) -> None:
+    with IndexManifest._lock:
+      self.entries = None
+      entries = self.load()
+      if ids:
+        entries[key] = sorted(ids)
+      else:
+        entries.pop(key, None)
+      self.save()
+
+  def save(self) -> None:
+    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    temp_path = f"{self.path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+      json.dump(self.entries or {}, f)
+    os.replace(temp_path, self.path)
@@ -1,5 +1,5 @@
 import traceback
-from typing import List
+from typing import List, Optional
 
 from langchain_community.document_loaders.doc_intelligence import \
     AzureAIDocumentIntelligenceLoader
@@ -7,8 +7,10 @@ from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore
 
 from ai_enterprise_agent.interface.settings import ISettings
+from ai_enterprise_agent.utils.executor_helper import run_in_executor
 
-from .loader import Loader
+from .loader import IngestionPipeline, Loader, ProgressCallback
+from .manifest import IndexManifest
 
 
 class MicrosoftLoader():
@@ -16,14 +18,14 @@ class MicrosoftLoader():
     resource = Loader.build(config)
     self.vector_store: VectorStore = resource.get('vector_store')
     self.embeddings: Embeddings = resource.get('embeddings')
+    self.pipeline: IngestionPipeline = resource.get('pipeline')
     self.config = config.get('document_intelligence')
 
-  async def load_file(self, file: str, file_name: str, chat_uid='global', tags:str = None) -> List[str]:
+  async def load_file(self, file: str, file_name: str, chat_uid='global', tags:str = None, on_progress: Optional[ProgressCallback] = None) -> List[str]:
     try:
-      documents = self.split_file(file)
+      documents = await run_in_executor(self.split_file, file)
       indexed_documents = Loader.index_documents(file_name, documents, chat_uid, tags, embeddings=self.embeddings)
-      documents = self.vector_store.add_documents(documents=indexed_documents)
-      return documents
+      return await self.pipeline.sync(IndexManifest.build_key(chat_uid, file_name), indexed_documents, on_progress=on_progress)
     except Exception as e:
       print(f'Error while loading file: {e}')
       traceback.print_exc()
@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from ai_enterprise_agent.interface.settings import IIngestion
+
+DEFAULT_CHUNK_SIZE = 512
+DEFAULT_CHUNK_OVERLAP = 64
+DEFAULT_ENCODING = 'cl100k_base'
+
+
+class TokenSplitter:
+  """
+  Incremental, token-aware splitter.
+
+  Consumes an iterable of text units (file lines, CSV rows) and yields
+  documents of at most chunk_size tokens, carrying up to chunk_overlap tokens
+  of trailing units into the next chunk. Only the current chunk is held in
+  memory, so the source is never read as a whole.
+  """
+
+  def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, chunk_overlap: int = DEFAULT_CHUNK_OVERLAP, encoding_name: str = DEFAULT_ENCODING) -> None:
+    if chunk_overlap >= chunk_size:
+      raise ValueError('Chunk overlap must be smaller than chunk size')
+    self.chunk_size = chunk_size
+    self.chunk_overlap = chunk_overlap
+    self.encoding = self.get_encoding(encoding_name)
+
+  @staticmethod
+  def from_config(config: Optional[IIngestion]) -> 'TokenSplitter':
+    config = config or {}
+    return TokenSplitter(
+      chunk_size=config.get('chunk_size') or DEFAULT_CHUNK_SIZE,
+      chunk_overlap=DEFAULT_CHUNK_OVERLAP if config.get('chunk_overlap') is None else config.get('chunk_overlap'),
+      encoding_name=config.get('encoding') or DEFAULT_ENCODING,
+    )
+
+  @staticmethod
+  def get_encoding(encoding_name: str):
+    try:
+      import tiktoken
+      return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+      print(f'Error loading tokenizer {encoding_name}, approximating token counts: {e}')
+      return None
+
+  def count(self, text: str) -> int:
+    if self.encoding is None:
+      return max(1, len(text) // 4)
+    return len(self.encoding.encode(text, disallowed_special=()))
+
+  def split_unit(self, text: str) -> Iterator[str]:
+    if self.encoding is None:
+      size, step = self.chunk_size * 4, (self.chunk_size - self.chunk_overlap) * 4
+      for start in range(0, len(text), step):
+        yield text[start:start + size]
+      return
+
+    tokens = self.encoding.encode(text, disallowed_special=())
+    step = self.chunk_size - self.chunk_overlap
+    for start in range(0, len(tokens), step):
+      yield self.encoding.decode(tokens[start:start + self.chunk_size])
+      if start + self.chunk_size >= len(tokens):
+        return
+
+  def split(self, units: Iterable[str], metadata: Optional[Dict[str, Any]] = None) -> Iterator[Document]:
+    metadata = metadata or {}
+    buffer: List[Tuple[str, int]] = []
+    buffer_tokens = 0
+    index = 0
+
+    def emit(parts: List[Tuple[str, int]]) -> Document:
+      nonlocal index
+      document = Document(page_content=''.join(text for text, _ in parts), metadata={**metadata, 'chunk': index})
+      index += 1
+      return document
+
+    for unit in units:
+      if not unit:
+        continue
+      tokens = self.count(unit)
+
+      if tokens > self.chunk_size:
+        if buffer:
+          yield emit(buffer)
+          buffer, buffer_tokens = [], 0
+        for piece in self.split_unit(unit):
+          yield emit([(piece, 0)])
+        continue
+
+      if buffer and buffer_tokens + tokens > self.chunk_size:
+        yield emit(buffer)
+        overlap: List[Tuple[str, int]] = []
+        overlap_tokens = 0
+        for text, count in reversed(buffer):
+          if overlap_tokens + count > self.chunk_overlap:
+            break
+          overlap.insert(0, (text, count))
+          overlap_tokens += count
+        while overlap and overlap_tokens + tokens > self.chunk_size:
+          overlap_tokens -= overlap.pop(0)[1]
+        buffer, buffer_tokens = overlap, overlap_tokens
+
+      buffer.append((unit, tokens))
+      buffer_tokens += tokens
+
+    if buffer:
+      yield emit(buffer)
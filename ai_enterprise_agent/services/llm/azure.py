@@ -1,3 +1,6 @@
+from typing import Optional
+
+from langchain_core.caches import BaseCache
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import AzureChatOpenAI
 
@@ -23,10 +26,13 @@ class AzureChatModel:
         self.azure_endpoint = model_config.get('endpoint')
         self.streaming = True
 
-    def build(self) -> BaseChatModel:
+    def build(self, cache: Optional[BaseCache] = None) -> BaseChatModel:
         """
         Build and return an Azure Chat OpenAI model.
 
+        Args:
+            cache (BaseCache, optional): Response cache for the model.
+
         Returns:
             BaseChatModel: An instance of the Azure Chat OpenAI model.
         """
@@ -37,5 +43,6 @@ class AzureChatModel:
             api_version=self.api_version,
             api_key=self.api_key,
             azure_endpoint=azure_endpoint,
-            streaming=self.streaming
+            streaming=self.streaming,
+            cache=cache
         )
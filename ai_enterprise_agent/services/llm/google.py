@@ -1,3 +1,6 @@
+from typing import Optional
+
+from langchain_core.caches import BaseCache
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -22,10 +25,13 @@ class GoogleChatModel:
         self.streaming = True
         self.convert_system_message_to_human = True
 
-    def build(self) -> BaseChatModel:
+    def build(self, cache: Optional[BaseCache] = None) -> BaseChatModel:
         """
         Build and return a Google Chat Generative AI model.
 
+        Args:
+            cache (BaseCache, optional): Response cache for the model.
+
         Returns:
             BaseChatModel: An instance of the Google Chat Generative AI model.
         """
@@ -34,5 +40,6 @@ class GoogleChatModel:
             model=self.model,
             google_api_key=self.google_api_key,
             streaming=self.streaming,
-            convert_system_message_to_human=self.convert_system_message_to_human
+            convert_system_message_to_human=self.convert_system_message_to_human,
+            cache=cache
         )
@@ -1,6 +1,7 @@
 from langchain_core.language_models.chat_models import BaseChatModel
 
 from ai_enterprise_agent.interface.settings import LLM_TYPE, IModel
+from ai_enterprise_agent.services.cache.llm_cache import LLMCacheFactory
 from ai_enterprise_agent.services.llm.azure import AzureChatModel
 from ai_enterprise_agent.services.llm.google import GoogleChatModel
 
@@ -9,7 +10,9 @@ class ModelFactory:
     @staticmethod
     def build(config: IModel) -> BaseChatModel:
         """
-        Build a chat model based on the provided configuration.
+        Build a chat model based on the provided configuration. When a cache
+        is configured and the temperature is 0, responses are cached by the
+        rendered prompt and model parameters.
 
         Args:
             config (IModel): The configuration for the model.
@@ -27,4 +30,5 @@ class ModelFactory:
             chat_model = AzureChatModel(config)
         else:
             raise ValueError("Invalid model type: {}".format(model_type))
-        return chat_model.build()
+        cache = LLMCacheFactory.build(config.get('cache'), config.get('temperature'))
+        return chat_model.build(cache=cache)
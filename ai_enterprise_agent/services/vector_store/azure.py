@@ -1,3 +1,4 @@
+import base64
 from typing import Any, Iterable, List, Optional, Tuple, Type
 
 from azure.search.documents.indexes.models import (SearchableField,
@@ -14,6 +15,7 @@ from ai_enterprise_agent.interface.settings import VECTOR_STORE_TYPE, ISettings
 from ai_enterprise_agent.interface.vector_search import ISearchType
 from ai_enterprise_agent.services.vector_store.embedding import \
     EmbeddingFactory
+from ai_enterprise_agent.utils.executor_helper import run_in_executor
 
 
 class CustomDocument(Document):
@@ -50,12 +52,13 @@ class AzureVectorSearch(VectorStore):
       fields=fields
     )
 
-  def similarity_search(self, query: str, k: int = 4, search_type: ISearchType = ISearchType.similarity, filters:str = None) -> List[Document]:
+  def similarity_search(self, query: str, k: int = 4, search_type: ISearchType = ISearchType.similarity, filters:str = None, **kwargs: Any) -> List[Document]:
     return self.vector_store.similarity_search(
       query=query,
       k=k,
       search_type=search_type,
-      filters=filters
+      filters=filters,
+      **kwargs
     )
 
   def similarity_search_with_relevance_scores(self, query: str,  score_threshold: float, k: Optional[int], **kwargs) -> List[Tuple[Document, float]]:
@@ -69,8 +72,28 @@ class AzureVectorSearch(VectorStore):
   def search(self, query: str, search_type: str = ISearchType.similarity, **kwargs: Any) -> List[Document]:
     return self.vector_store.search(query, search_type, **kwargs)
 
-  def add_documents(self, documents: List[CustomDocument]):
-    return self.vector_store.add_documents(documents=documents)
+  def add_documents(self, documents: List[CustomDocument], **kwargs: Any):
+    ids = [getattr(document, 'id', None) for document in documents]
+    if all(ids):
+      kwargs.setdefault('keys', ids)
+    return self.vector_store.add_documents(documents=documents, **kwargs)
+
+  def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+    if not ids:
+      return False
+    # AzureSearch.add_texts stores each key base64-urlsafe encoded as the document id
+    keys = [base64.urlsafe_b64encode(id.encode('utf-8')).decode('ascii') for id in ids]
+    self.vector_store.client.delete_documents(documents=[{'id': key} for key in keys])
+    return True
+
+  async def asimilarity_search(self, query: str, k: int = 4, filters: str = None, **kwargs: Any) -> List[Document]:
+    return await run_in_executor(self.similarity_search, query=query, k=k, filters=filters, **kwargs)
+
+  async def aadd_documents(self, documents: List[Document], **kwargs: Any) -> List[str]:
+    return await run_in_executor(self.add_documents, documents, **kwargs)
+
+  async def adelete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+    return await run_in_executor(self.delete, ids=ids, **kwargs)
 
   def add_texts(
         self,
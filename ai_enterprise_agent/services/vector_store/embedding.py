@@ -1,3 +1,5 @@
+from typing import Optional
+
 import boto3
 from langchain_community.embeddings.bedrock import BedrockEmbeddings
 from langchain_core.embeddings import Embeddings
@@ -7,6 +9,8 @@ from langchain_openai import AzureOpenAIEmbeddings
 from ai_enterprise_agent.interface.settings import (LLM_TYPE,
                                                     VECTOR_STORE_TYPE,
                                                     IEmbedding, ISettings)
+from ai_enterprise_agent.services.cache.embedding_cache import \
+    CachedEmbeddings
 
 
 class AzureEmbedding:
@@ -44,20 +48,56 @@ class GoogleEmbedding:
 
 class EmbeddingFactory:
 
+  builders = {
+    'azure': AzureEmbedding,
+    'bedrock': BedrockEmbedding,
+    'google': GoogleEmbedding,
+  }
+
+  @staticmethod
+  def provider_for_model(model_type: LLM_TYPE) -> Optional[str]:
+    if model_type == LLM_TYPE.aws:
+        return 'bedrock'
+    elif model_type == LLM_TYPE.azure:
+        return 'azure'
+    elif model_type == LLM_TYPE.google:
+        return 'google'
+    return None
+
   @staticmethod
   def build(type: VECTOR_STORE_TYPE, config: ISettings) -> Embeddings:
     vector_store_config = config.get('vector_store')
+    embedding_config = vector_store_config.get('embedding')
+    provider = None
     if type == VECTOR_STORE_TYPE.azure_search:
-        return AzureEmbedding.build(vector_store_config.get('embedding'))
+        provider = 'azure'
     elif type == VECTOR_STORE_TYPE.open_search:
-        return BedrockEmbedding.build(vector_store_config.get('embedding'))
-    elif type == VECTOR_STORE_TYPE.pinecone:
-        model_type = config.get('model', {}).get('type')
-        if model_type == LLM_TYPE.aws:
-            return BedrockEmbedding.build(vector_store_config.get('embedding'))
-        elif model_type == LLM_TYPE.azure:
-          return AzureEmbedding.build(vector_store_config.get('embedding'))
-        elif model_type == LLM_TYPE.google:
-            return GoogleEmbedding.build(vector_store_config.get('embedding'))
-    raise ValueError("Invalid or unsupported embedding type")
+        provider = 'bedrock'
+    elif type in (VECTOR_STORE_TYPE.pinecone, VECTOR_STORE_TYPE.local):
+        provider = EmbeddingFactory.provider_for_model(config.get('model', {}).get('type'))
+    return EmbeddingFactory.build_provider(provider, embedding_config)
+
+  @staticmethod
+  def build_for_model(config: ISettings, embedding_config: IEmbedding) -> Embeddings:
+    """
+    Build embeddings from the provider of the configured chat model, for
+    features that embed text outside of a vector store.
+    """
+    provider = EmbeddingFactory.provider_for_model(config.get('model', {}).get('type'))
+    return EmbeddingFactory.build_provider(provider, embedding_config)
+
+  @staticmethod
+  def build_provider(provider: Optional[str], embedding_config: IEmbedding) -> Embeddings:
+    builder = EmbeddingFactory.builders.get(provider)
+    if builder is None:
+      raise ValueError("Invalid or unsupported embedding type")
 
+    embeddings = builder.build(embedding_config)
+    return EmbeddingFactory.with_cache(embeddings, provider, embedding_config)
+
+  @staticmethod
+  def with_cache(embeddings: Embeddings, provider: str, config: IEmbedding) -> Embeddings:
+    cache_config = config.get('cache') if config else None
+    if not cache_config or not cache_config.get('enabled', True):
+      return embeddings
+    return CachedEmbeddings(embeddings, provider, config.get('model_deployment'), cache_config)
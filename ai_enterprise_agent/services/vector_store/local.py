@@ -0,0 +1,160 @@
+import json
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.vectorstores import VectorStore
+
+from ai_enterprise_agent.interface.settings import VECTOR_STORE_TYPE, ISettings
+from ai_enterprise_agent.interface.vector_search import ISearchType
+from ai_enterprise_agent.services.vector_store.embedding import \
+    EmbeddingFactory
+from ai_enterprise_agent.services.vector_store.local_index import (
+    DEFAULT_IVF_MIN_ROWS, DEFAULT_NPROBE, DEFAULT_RERANK_FACTOR,
+    LocalVectorIndex)
+from ai_enterprise_agent.utils.executor_helper import run_in_executor
+
+DOCUMENT_FIELDS = ('chat_thread_id', 'user', 'tags')
+
+
+class LocalVectorSearch(VectorStore):
+  """
+  Vector store kept in the worker process, for tests and edge deployments
+  without a cloud search service. Filters are a dict of metadata values
+  (or a JSON string of one); a list value matches any of its items.
+  Writes are kept in memory until flush() saves the index file.
+  """
+
+  def __init__(self, config: ISettings, model: BaseChatModel) -> None:
+    super().__init__()
+    self.config = config
+    self.model = model
+    self.embedding_function = EmbeddingFactory.build(VECTOR_STORE_TYPE.local, config)
+    self.vector_store = self.build()
+
+  def build(self) -> LocalVectorIndex:
+    config = self.config.get('vector_store')
+    return LocalVectorIndex.for_index(
+      config.get('index_name'),
+      config.get('path'),
+      ann=config.get('ann'),
+      nlist=config.get('nlist'),
+      nprobe=config.get('nprobe') or DEFAULT_NPROBE,
+      ivf_min_rows=config.get('ivf_min_rows') or DEFAULT_IVF_MIN_ROWS,
+      dtype=config.get('vector_dtype') or 'float32',
+      quantization=config.get('quantization'),
+      rerank_factor=config.get('rerank_factor') or DEFAULT_RERANK_FACTOR,
+    )
+
+  @property
+  def embeddings(self) -> Embeddings:
+    return self.embedding_function
+
+  @staticmethod
+  def parse_filters(filters: Union[str, Dict[str, Any], None]) -> Optional[Dict[str, Any]]:
+    if not filters:
+      return None
+    if isinstance(filters, dict):
+      return filters
+    try:
+      parsed = json.loads(filters)
+    except ValueError:
+      raise ValueError("Local vector store filters must be a dict or a JSON object")
+    if not isinstance(parsed, dict):
+      raise ValueError("Local vector store filters must be a dict or a JSON object")
+    return parsed
+
+  def similarity_search_by_vector_with_scores(self, embedding: List[float], k: int = 4, filters: Union[str, Dict[str, Any], None] = None) -> List[Tuple[Document, float]]:
+    matches = self.vector_store.search(embedding, k=k, filters=self.parse_filters(filters))
+    return [(Document(page_content=text, metadata=metadata), score) for _, text, metadata, score in matches]
+
+  def similarity_search(self, query: str, k: int = 4, filters: Union[str, Dict[str, Any], None] = None, **kwargs: Any) -> List[Document]:
+    embedding = self.embedding_function.embed_query(query)
+    return [document for document, _ in self.similarity_search_by_vector_with_scores(embedding, k, filters)]
+
+  def similarity_search_with_relevance_scores(self, query: str, score_threshold: float = None, k: Optional[int] = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+    embedding = self.embedding_function.embed_query(query)
+    matches = self.similarity_search_by_vector_with_scores(embedding, k or 4, kwargs.get('filters'))
+    results = [(document, (1 + score) / 2) for document, score in matches]
+    if score_threshold is not None:
+      results = [(document, score) for document, score in results if score >= score_threshold]
+    return results
+
+  def search(self, query: str, search_type: str = ISearchType.similarity, **kwargs: Any) -> List[Document]:
+    return self.similarity_search(query, **kwargs)
+
+  def evaluate_recall(self, queries: Optional[List[str]] = None, k: int = 10, sample: int = 100) -> Dict[str, Any]:
+    """
+    Report recall@k of the configured quantization and ANN settings against
+    exact float32 search, over the given questions or a sample of the
+    indexed chunks.
+    """
+    vectors = self.embedding_function.embed_documents(queries) if queries else None
+    return self.vector_store.evaluate_recall(vectors, k=k, sample=sample)
+
+  async def asimilarity_search(self, query: str, k: int = 4, filters: Union[str, Dict[str, Any], None] = None, **kwargs: Any) -> List[Document]:
+    embedding = await self.embedding_function.aembed_query(query)
+    matches = await run_in_executor(self.similarity_search_by_vector_with_scores, embedding, k, filters)
+    return [document for document, _ in matches]
+
+  @staticmethod
+  def build_records(documents: List[Document]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+    metadatas = []
+    for document in documents:
+      metadata = dict(document.metadata or {})
+      for field in DOCUMENT_FIELDS:
+        if getattr(document, field, None) is not None:
+          metadata.setdefault(field, getattr(document, field))
+      metadatas.append(metadata)
+    ids = [getattr(document, 'id', None) or str(uuid.uuid4()) for document in documents]
+    return ids, [document.page_content for document in documents], metadatas
+
+  def store(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]], vectors: List[List[float]]) -> List[str]:
+    return self.vector_store.upsert(ids, texts, metadatas, vectors)
+
+  def add_documents(self, documents: List[Document], **kwargs: Any) -> List[str]:
+    ids, texts, metadatas = self.build_records(documents)
+    return self.add_texts(texts, metadatas, ids=ids)
+
+  async def aadd_documents(self, documents: List[Document], **kwargs: Any) -> List[str]:
+    ids, texts, metadatas = self.build_records(documents)
+    vectors = await self.embedding_function.aembed_documents(texts)
+    return await run_in_executor(self.store, ids, texts, metadatas, vectors)
+
+  def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+    texts = list(texts)
+    metadatas = metadatas or [{} for _ in texts]
+    ids = kwargs.get('ids') or [str(uuid.uuid4()) for _ in texts]
+    vectors = self.embedding_function.embed_documents(texts)
+    return self.store(ids, texts, metadatas, vectors)
+
+  def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+    if not ids:
+      return False
+    return self.vector_store.delete(ids)
+
+  async def adelete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+    return await run_in_executor(self.delete, ids=ids, **kwargs)
+
+  def flush(self) -> None:
+    """
+    Write pending upserts and deletes to the index file. Writes only update
+    the in-memory index, so callers persist once after a batch of them.
+    """
+    self.vector_store.flush()
+
+  def from_texts(
+        cls: Type[Any],
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ):
+    pass
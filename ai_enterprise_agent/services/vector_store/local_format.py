@@ -0,0 +1,136 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b'AIEVIDX1'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQQQQQ')
+HEADER_SIZE = 128
+ALIGNMENT = 64
+DTYPES = {1: np.dtype('<f4'), 2: np.dtype('<f2')}
+DTYPE_CODES = {'float32': 1, 'float16': 2}
+
+# File layout, little-endian, every section aligned to 64 bytes:
+#   header   magic, version, dtype code, rows, dims and the offsets of the
+#            vector block, id table, text table and metadata table
+#   vectors  rows x dims float32 or float16, row-major
+#   tables   each one is (rows + 1) uint64 offsets followed by a UTF-8 blob;
+#            entry i is blob[offsets[i]:offsets[i + 1]], metadata as JSON
+
+
+class MappedStrings(Sequence):
+  """
+  Read-only sequence over one table of the mapped file; entries are decoded
+  on access, so opening the file does not touch them.
+  """
+
+  def __init__(self, buffer: mmap.mmap, offset: int, count: int, decode: Callable[[bytes], Any]) -> None:
+    self.buffer = buffer
+    self.count = count
+    self.decode = decode
+    self.offsets = np.frombuffer(buffer, dtype='<u8', count=count + 1, offset=offset)
+    self.blob = offset + (count + 1) * 8
+
+  def __len__(self) -> int:
+    return self.count
+
+  def __getitem__(self, row: int) -> Any:
+    if row < 0:
+      row += self.count
+    if not 0 <= row < self.count:
+      raise IndexError(row)
+    start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+    return self.decode(self.buffer[self.blob + start:self.blob + end])
+
+  def __iter__(self) -> Iterator[Any]:
+    return (self[row] for row in range(self.count))
+
+
+def align(position: int) -> int:
+  return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_table(f, values: List[bytes]) -> None:
+  offsets = np.zeros(len(values) + 1, dtype='<u8')
+  np.cumsum([len(value) for value in values], out=offsets[1:])
+  f.write(offsets.tobytes())
+  for value in values:
+    f.write(value)
+
+
+def pad(f) -> int:
+  position = f.tell()
+  f.write(b'\0' * (align(position) - position))
+  return f.tell()
+
+
+def write_index(path: str, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]], vectors: np.ndarray, dtype: str = 'float32') -> os.stat_result:
+  """
+  Write the index file to a uniquely named temporary file in the same
+  directory and move it into place, so readers never see a partial file and
+  processes that mapped the previous version keep a consistent view until
+  they reopen it. Concurrent writers of one path must still be serialized
+  by the caller; the last one to finish wins.
+
+  Returns:
+      os.stat_result: The status of the written file.
+  """
+  code = DTYPE_CODES.get(dtype)
+  if code is None:
+    raise ValueError(f"Invalid vector dtype: {dtype}")
+  rows = len(ids)
+  dims = vectors.shape[1] if rows else 0
+  directory = os.path.dirname(path)
+  if directory:
+    os.makedirs(directory, exist_ok=True)
+
+  fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(b'\0' * HEADER_SIZE)
+      vectors_offset = pad(f)
+      f.write(np.ascontiguousarray(vectors[:rows], dtype=DTYPES[code]).tobytes())
+      ids_offset = pad(f)
+      write_table(f, [id.encode('utf-8') for id in ids])
+      texts_offset = pad(f)
+      write_table(f, [text.encode('utf-8') for text in texts])
+      metadatas_offset = pad(f)
+      write_table(f, [json.dumps(metadata, default=str).encode('utf-8') for metadata in metadatas])
+      f.seek(0)
+      f.write(HEADER.pack(MAGIC, VERSION, code, rows, dims, vectors_offset, ids_offset, texts_offset, metadatas_offset))
+      f.flush()
+      os.fsync(f.fileno())
+      stat = os.fstat(f.fileno())
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, path)
+    return stat
+  except BaseException:
+    if os.path.exists(temp_path):
+      os.remove(temp_path)
+    raise
+
+
+def open_index(path: str) -> Tuple[np.ndarray, MappedStrings, MappedStrings, MappedStrings]:
+  """
+  Map an index file read-only. The vectors are a zero-copy view over the
+  mapping, so every process opening the same file shares its page cache.
+
+  Returns:
+      Tuple: the vectors and the id, text and metadata tables.
+  """
+  with open(path, 'rb') as f:
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  magic, version, code, rows, dims, vectors_offset, ids_offset, texts_offset, metadatas_offset = HEADER.unpack_from(buffer, 0)
+  if magic != MAGIC or version != VERSION or code not in DTYPES:
+    buffer.close()
+    raise ValueError(f"Invalid local vector index file: {path}")
+  vectors = np.frombuffer(buffer, dtype=DTYPES[code], count=rows * dims, offset=vectors_offset).reshape(rows, dims)
+  ids = MappedStrings(buffer, ids_offset, rows, lambda value: value.decode('utf-8'))
+  texts = MappedStrings(buffer, texts_offset, rows, lambda value: value.decode('utf-8'))
+  metadatas = MappedStrings(buffer, metadatas_offset, rows, json.loads)
+  return vectors, ids, texts, metadatas
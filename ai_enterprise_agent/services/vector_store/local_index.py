@@ -0,0 +1,596 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai_enterprise_agent.services.vector_store.local_format import (
+    open_index, write_index)
+from ai_enterprise_agent.services.vector_store.quantization import \
+    QuantizedVectors
+from ai_enterprise_agent.utils.executor_helper import get_executor
+
+DEFAULT_INITIAL_CAPACITY = 1024
+SCORE_BLOCK_SIZE = 65536
+INDEX_FILE_EXTENSION = '.vidx'
+DEFAULT_IVF_MIN_ROWS = 50000
+DEFAULT_NPROBE = 16
+DEFAULT_RERANK_FACTOR = 4
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_SIZE = 65536
+REFRESH_INTERVAL = 1.0
+
+Filters = Optional[Dict[str, Any]]
+Match = Tuple[str, str, Dict[str, Any], float]
+
+
+class IVFIndex:
+  """
+  Inverted-file index: rows are clustered with spherical k-means and a query
+  only scores the rows of its nprobe closest clusters. Rows added after the
+  index was trained are scored exhaustively until the next rebuild.
+  """
+
+  def __init__(self, centroids: np.ndarray, lists: List[np.ndarray], trained_rows: int) -> None:
+    self.centroids = centroids
+    self.lists = lists
+    self.trained_rows = trained_rows
+
+  @staticmethod
+  def train(vectors: np.ndarray, nlist: Optional[int] = None, seed: int = 0) -> 'IVFIndex':
+    rows = vectors.shape[0]
+    nlist = max(1, min(nlist or int(np.sqrt(rows)), rows))
+    rng = np.random.default_rng(seed)
+    sample = np.asarray(vectors[np.sort(rng.choice(rows, size=min(rows, KMEANS_SAMPLE_SIZE), replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].astype(np.float32)
+    for _ in range(KMEANS_ITERATIONS):
+      assignment = np.argmax(sample @ centroids.T, axis=1)
+      for cluster in range(nlist):
+        members = sample[assignment == cluster]
+        if len(members):
+          centroid = members.sum(axis=0)
+          norm = np.linalg.norm(centroid)
+          centroids[cluster] = centroid / norm if norm else centroid
+
+    assignment = np.empty(rows, dtype=np.int32)
+    for start in range(0, rows, KMEANS_SAMPLE_SIZE):
+      block = np.asarray(vectors[start:start + KMEANS_SAMPLE_SIZE], dtype=np.float32)
+      assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    lists = [np.flatnonzero(assignment == cluster) for cluster in range(nlist)]
+    return IVFIndex(centroids, lists, rows)
+
+  def candidates(self, vector: np.ndarray, nprobe: int, rows: int) -> np.ndarray:
+    nprobe = min(nprobe, len(self.lists))
+    closest = np.argpartition(-(self.centroids @ vector), nprobe - 1)[:nprobe]
+    candidates = [self.lists[cluster] for cluster in closest]
+    if rows > self.trained_rows:
+      candidates.append(np.arange(self.trained_rows, rows))
+    return np.concatenate(candidates) if candidates else np.empty(0, dtype=np.int64)
+
+
+class MetadataColumn:
+  """
+  One metadata field decoded once into an integer code per row, so a filter
+  on it is a vectorized lookup instead of a Python loop over the rows.
+  Unhashable values (lists, dicts) are coded by their JSON form.
+  """
+
+  def __init__(self, field: str) -> None:
+    self.field = field
+    self.codes: Dict[Any, int] = {}
+    self.column = np.zeros(0, dtype=np.int32)
+
+  @staticmethod
+  def key(value: Any) -> Any:
+    try:
+      hash(value)
+      return value
+    except TypeError:
+      return ('json', json.dumps(value, sort_keys=True, default=str))
+
+  def code(self, value: Any) -> int:
+    key = self.key(value)
+    code = self.codes.get(key)
+    if code is None:
+      code = self.codes[key] = len(self.codes)
+    return code
+
+  def set(self, row: int, metadata: Dict[str, Any]) -> None:
+    if row >= len(self.column):
+      column = np.zeros(max(row + 1, len(self.column) * 2, DEFAULT_INITIAL_CAPACITY), dtype=np.int32)
+      column[:len(self.column)] = self.column
+      self.column = column
+    self.column[row] = self.code(metadata.get(self.field))
+
+  def extend(self, metadatas: Sequence[Dict[str, Any]], start: int, end: int) -> None:
+    for row in range(start, end):
+      self.set(row, metadatas[row])
+
+  def take(self, rows: np.ndarray) -> None:
+    self.column = self.column[rows]
+
+  def mask(self, expected: Any, size: int) -> np.ndarray:
+    """
+    Rows below size whose value equals expected, or any of its items when
+    expected is a list.
+    """
+    values = expected if isinstance(expected, (list, tuple, set)) else [expected]
+    codes = [self.codes[key] for key in map(self.key, values) if key in self.codes]
+    return np.isin(self.column[:size], codes)
+
+
+class LocalVectorIndex:
+  """
+  In-process vector index: L2-normalized float32 embeddings in one
+  contiguous matrix, scored with a single matrix-vector product.
+
+  Rows are appended into preallocated capacity; upserting an existing id
+  overwrites its row and deleting marks it dead until the next compaction.
+  Above ivf_min_rows an IVF index, trained in the background, narrows the
+  scan, and an optional float16/int8 quantized copy serves a first pass that
+  is re-ranked at full precision. The index is saved as a single file (see
+  local_format) and reopened memory-mapped: nothing is parsed at startup,
+  the id lookup is built on the first write and the mapped vectors are
+  copied into memory only then. A file replaced by another process is
+  reopened on the next lookup or search, unless this index has unsaved writes.
+  """
+
+  _indexes: Dict[str, 'LocalVectorIndex'] = {}
+  _registry_lock = threading.Lock()
+
+  def __init__(self, path: Optional[str] = None, ann: Optional[str] = None, nlist: Optional[int] = None, nprobe: int = DEFAULT_NPROBE, ivf_min_rows: int = DEFAULT_IVF_MIN_ROWS, dtype: str = 'float32', quantization: Optional[str] = None, rerank_factor: int = DEFAULT_RERANK_FACTOR) -> None:
+    self.path = path
+    self.dtype = dtype
+    self.quantization = quantization
+    self.rerank_factor = max(1, rerank_factor)
+    self.quantized: Optional[QuantizedVectors] = None
+    self.ann = ann
+    self.nlist = nlist
+    self.nprobe = nprobe
+    self.ivf_min_rows = ivf_min_rows
+    self.vectors: Optional[np.ndarray] = None
+    self.alive = np.zeros(0, dtype=bool)
+    self.size = 0
+    self.ids: Sequence[str] = []
+    self.rows: Optional[Dict[str, int]] = {}
+    self.texts: Sequence[str] = []
+    self.metadatas: Sequence[Dict[str, Any]] = []
+    self.ivf: Optional[IVFIndex] = None
+    self.columns: Dict[str, MetadataColumn] = {}
+    self.dirty = False
+    self.quantizing = False
+    self.file_stamp: Optional[Tuple[int, int]] = None
+    self.checked_at = 0.0
+    self.training = False
+    self.generation = 0
+    self.lock = threading.RLock()
+    self.write_lock = threading.Lock()
+
+  @staticmethod
+  def for_index(index_name: Optional[str], directory: Optional[str] = None, **options: Any) -> 'LocalVectorIndex':
+    """
+    Return the index shared by every store of the process with the same name
+    and directory, loading it from disk on first use.
+    """
+    path = os.path.join(directory, f"{index_name or 'default'}{INDEX_FILE_EXTENSION}") if directory else None
+    key = path or f"memory:{index_name or 'default'}"
+    with LocalVectorIndex._registry_lock:
+      index = LocalVectorIndex._indexes.get(key)
+      if index is None:
+        index = LocalVectorIndex(path=path, **options)
+        if path and os.path.exists(path):
+          index.load()
+        LocalVectorIndex._indexes[key] = index
+        return index
+    index.refresh()
+    return index
+
+  @staticmethod
+  def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+  def ensure_capacity(self, rows: int, dimensions: int) -> None:
+    if self.vectors is not None and self.vectors.shape[1] != dimensions:
+      raise ValueError(f"Embedding dimension {dimensions} does not match the index dimension {self.vectors.shape[1]}")
+    capacity = 0 if self.vectors is None else self.vectors.shape[0]
+    writable = self.vectors is not None and self.vectors.flags.writeable
+    if rows <= capacity and writable:
+      return
+    capacity = max(rows, capacity * 2, DEFAULT_INITIAL_CAPACITY)
+    vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+    alive = np.zeros(capacity, dtype=bool)
+    if self.size:
+      vectors[:self.size] = self.vectors[:self.size]
+      alive[:self.size] = self.alive[:self.size]
+    self.vectors, self.alive = vectors, alive
+
+  def ensure_writable(self) -> None:
+    """
+    Turn the mapped tables into lists and build the id lookup before a write.
+    """
+    if self.rows is None:
+      self.ids = list(self.ids)
+      self.texts = list(self.texts)
+      self.metadatas = list(self.metadatas)
+      self.rows = {id: row for row, id in enumerate(self.ids) if self.alive[row]}
+
+  def upsert(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]], vectors: Iterable[List[float]]) -> List[str]:
+    vectors = self.normalize(np.asarray(list(vectors), dtype=np.float32))
+    if not len(ids):
+      return []
+    with self.lock:
+      self.ensure_writable()
+      self.ensure_capacity(self.size + len(ids), vectors.shape[1])
+      for id, text, metadata, vector in zip(ids, texts, metadatas, vectors):
+        row = self.rows.get(id)
+        if row is None:
+          row = self.size
+          self.size += 1
+          self.rows[id] = row
+          self.ids.append(id)
+          self.texts.append(text)
+          self.metadatas.append(metadata)
+        else:
+          self.texts[row] = text
+          self.metadatas[row] = metadata
+          self.generation += 1
+          if self.ivf is not None and row < self.ivf.trained_rows:
+            self.ivf = None
+          if self.quantized is not None and row < self.quantized.rows:
+            self.quantized = None
+        self.vectors[row] = vector
+        self.alive[row] = True
+        for column in self.columns.values():
+          column.set(row, metadata)
+      self.dirty = True
+    return list(ids)
+
+  def delete(self, ids: List[str]) -> bool:
+    with self.lock:
+      self.ensure_writable()
+      rows = [self.rows.pop(id) for id in ids if id in self.rows]
+      for row in rows:
+        self.alive[row] = False
+      self.dirty = self.dirty or bool(rows)
+      if self.size and (self.size - int(self.alive[:self.size].sum())) * 2 > self.size:
+        self.compact()
+      return bool(rows)
+
+  def compact(self) -> None:
+    with self.lock:
+      self.ensure_writable()
+      keep = np.flatnonzero(self.alive[:self.size])
+      self.vectors = np.ascontiguousarray(self.vectors[keep]) if len(keep) else None
+      self.alive = np.ones(len(keep), dtype=bool)
+      self.ids = [self.ids[row] for row in keep]
+      self.texts = [self.texts[row] for row in keep]
+      self.metadatas = [self.metadatas[row] for row in keep]
+      self.rows = {id: row for row, id in enumerate(self.ids)}
+      for column in self.columns.values():
+        column.take(keep)
+      self.size = len(keep)
+      self.generation += 1
+      self.ivf = None
+      self.quantized = None
+
+  def column(self, field: str) -> MetadataColumn:
+    """
+    Return the column of a metadata field, decoding it from every row on
+    first use. Decoding runs outside the lock: rows appended meanwhile are
+    added when the column is installed, and a column decoded from rows that
+    were overwritten or renumbered is decoded again.
+    """
+    with self.lock:
+      column = self.columns.get(field)
+      if column is not None:
+        return column
+      metadatas, size, generation = self.metadatas, self.size, self.generation
+    column = MetadataColumn(field)
+    column.extend(metadatas, 0, size)
+    with self.lock:
+      if generation != self.generation:
+        column, size = MetadataColumn(field), 0
+      column.extend(self.metadatas, size, self.size)
+      self.columns[field] = column
+      return column
+
+  def filter_mask(self, filters: Dict[str, Any], size: int) -> np.ndarray:
+    """
+    Rows below size whose metadata matches every filter. Must be called with
+    the lock held.
+    """
+    mask = np.ones(size, dtype=bool)
+    for field, expected in filters.items():
+      column = self.columns.get(field) or self.column(field)
+      mask &= column.mask(expected, size)
+    return mask
+
+  def use_ivf(self) -> Optional[IVFIndex]:
+    """
+    Return the IVF index a search may use, or None for an exact scan. A
+    missing or outgrown index is retrained on the shared executor; searches
+    keep using the previous index, or the exact scan, until it is swapped in.
+    Must be called with the lock held.
+    """
+    if self.ann != 'ivf' or self.size < self.ivf_min_rows:
+      return None
+    if not self.training and (self.ivf is None or self.size > self.ivf.trained_rows * 2):
+      self.training = True
+      get_executor().submit(self.train_ivf, self.vectors[:self.size], self.generation)
+    return self.ivf
+
+  def train_ivf(self, vectors: np.ndarray, generation: int) -> None:
+    """
+    Train an IVF index outside the lock. Rows below the snapshot size only
+    change through overwrites and compaction, which bump the generation, so
+    an index trained on a view of rows that changed meanwhile is discarded.
+    """
+    try:
+      ivf = IVFIndex.train(vectors, self.nlist)
+    except Exception as e:
+      print(f"Error training IVF index: {e}")
+      ivf = None
+    with self.lock:
+      self.training = False
+      if ivf is not None and generation == self.generation:
+        self.ivf = ivf
+
+  @staticmethod
+  def score(vectors: np.ndarray, rows: Optional[np.ndarray], size: int, query: np.ndarray) -> np.ndarray:
+    """
+    Dot products of the query with the given rows (all rows when None).
+    Non-float32 matrices are upcast block by block, so a float16 mapping is
+    never copied whole.
+    """
+    if vectors.dtype == np.float32:
+      return vectors[:size] @ query if rows is None else vectors[rows] @ query
+    count = size if rows is None else len(rows)
+    scores = np.empty(count, dtype=np.float32)
+    for start in range(0, count, SCORE_BLOCK_SIZE):
+      end = min(start + SCORE_BLOCK_SIZE, count)
+      block = vectors[start:end] if rows is None else vectors[rows[start:end]]
+      scores[start:end] = block.astype(np.float32) @ query
+    return scores
+
+  def use_quantization(self) -> Optional[QuantizedVectors]:
+    """
+    Return the quantized codes a search may use, or None to score at full
+    precision. Missing or outgrown codes are rebuilt on the shared executor,
+    like the IVF index. Must be called with the lock held.
+    """
+    if not self.quantization or not self.size:
+      return None
+    if not self.quantizing and (self.quantized is None or self.size > self.quantized.rows * 2):
+      self.quantizing = True
+      get_executor().submit(self.build_quantized, self.vectors[:self.size], self.generation)
+    return self.quantized
+
+  def build_quantized(self, vectors: np.ndarray, generation: int) -> None:
+    """
+    Build the quantized codes outside the lock, discarding them when rows
+    below the snapshot size changed meanwhile (see train_ivf).
+    """
+    try:
+      quantized = QuantizedVectors.build(self.quantization, vectors)
+    except Exception as e:
+      print(f"Error quantizing vectors: {e}")
+      quantized = None
+    with self.lock:
+      self.quantizing = False
+      if quantized is not None and generation == self.generation:
+        self.quantized = quantized
+
+  def first_pass(self, quantized: QuantizedVectors, vectors: np.ndarray, rows: Optional[np.ndarray], size: int, query: np.ndarray) -> np.ndarray:
+    """
+    Approximate scores from the quantized codes; rows appended since the
+    codes were built are scored at full precision.
+    """
+    if rows is None:
+      scores = np.empty(size, dtype=np.float32)
+      scores[:quantized.rows] = quantized.score(query)
+      if size > quantized.rows:
+        scores[quantized.rows:] = self.score(vectors, np.arange(quantized.rows, size), size, query)
+      return scores
+    scores = np.empty(len(rows), dtype=np.float32)
+    coded = rows < quantized.rows
+    scores[coded] = quantized.score(query, rows[coded])
+    if not coded.all():
+      scores[~coded] = self.score(vectors, rows[~coded], size, query)
+    return scores
+
+  @staticmethod
+  def top(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+  def search(self, vector: List[float], k: int = 4, filters: Filters = None, exact: bool = False) -> List[Match]:
+    """
+    Return the (id, text, metadata, cosine similarity) of the k closest live
+    rows whose metadata matches every filter. Rows are resolved against the
+    tables that were scored, so a concurrent compaction or reload cannot
+    renumber them in between.
+
+    With quantization, the first pass scores the quantized codes and the
+    best k * rerank_factor candidates are re-scored at full precision.
+    exact=True bypasses both the IVF index and quantization.
+    """
+    query = self.normalize(np.asarray(vector, dtype=np.float32))
+    self.refresh()
+    for field in filters or {}:
+      self.column(field)
+    with self.lock:
+      if not self.size or k <= 0:
+        return []
+      ivf = None if exact else self.use_ivf()
+      rows = ivf.candidates(query, self.nprobe, self.size) if ivf is not None else None
+      quantized = None if exact else self.use_quantization()
+      vectors, size = self.vectors, self.size
+      ids, texts, metadatas = self.ids, self.texts, self.metadatas
+      alive = self.alive[:size] & self.filter_mask(filters, size) if filters else self.alive
+
+    if rows is not None or filters:
+      rows = np.arange(size) if rows is None else rows
+      rows = rows[alive[rows]]
+      if not len(rows):
+        return []
+
+    if quantized is None:
+      scores = self.score(vectors, rows, size, query)
+    else:
+      scores = self.first_pass(quantized, vectors, rows, size, query)
+    if rows is None:
+      rows = np.flatnonzero(alive[:size])
+      scores = scores[rows]
+      if not len(rows):
+        return []
+
+    if quantized is not None:
+      rows = rows[self.top(scores, k * self.rerank_factor)]
+      scores = self.score(vectors, rows, size, query)
+    top = self.top(scores, k)
+    return [(ids[rows[i]], texts[rows[i]], dict(metadatas[rows[i]]), float(scores[i])) for i in top]
+
+  def evaluate_recall(self, queries: Optional[np.ndarray] = None, k: int = 10, sample: int = 100, seed: int = 0) -> Dict[str, Any]:
+    """
+    Measure recall@k of the configured search (IVF, quantization and
+    re-ranking) against exact float32 search, and the memory of the vectors
+    scored in the first pass.
+
+    Args:
+        queries (np.ndarray): Query embeddings; by default `sample` stored vectors.
+        k (int): The number of results compared.
+        sample (int): The number of stored vectors used as queries.
+
+    Returns:
+        Dict[str, Any]: recall, first_pass_recall, k, queries, quantization and bytes_per_vector.
+    """
+    with self.lock:
+      size = self.size
+      vectors = self.vectors[:size] if size else None
+      alive, ids, generation = self.alive[:size].copy(), self.ids, self.generation
+      if queries is None:
+        rng = np.random.default_rng(seed)
+        live = np.flatnonzero(alive)
+        queries = vectors[rng.choice(live, size=min(sample, len(live)), replace=False)] if len(live) else np.zeros((0, 0))
+      # Build what a search would still be waiting for here, so the
+      # configured path is measured rather than the exact fallback.
+      pending_ivf = self.ann == 'ivf' and size >= self.ivf_min_rows and (self.ivf is None or size > self.ivf.trained_rows * 2)
+      pending_quantization = bool(self.quantization and size) and (self.quantized is None or size > self.quantized.rows * 2)
+      self.training = self.training or pending_ivf
+      self.quantizing = self.quantizing or pending_quantization
+    if pending_ivf:
+      self.train_ivf(vectors, generation)
+    if pending_quantization:
+      self.build_quantized(vectors, generation)
+    with self.lock:
+      quantized = self.quantized
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+
+    recall, first_pass_recall = 0.0, 0.0
+    for query in queries:
+      expected = {match[0] for match in self.search(query, k, exact=True)}
+      if not expected:
+        continue
+      recall += len(expected & {match[0] for match in self.search(query, k)}) / len(expected)
+      if quantized is not None:
+        scores = self.first_pass(quantized, vectors, None, size, self.normalize(query))
+        live = np.flatnonzero(alive)
+        first = {ids[row] for row in live[self.top(scores[live], k)]}
+        first_pass_recall += len(expected & first) / len(expected)
+      else:
+        first_pass_recall += 1.0
+
+    count = max(len(queries), 1)
+    codes = quantized.codes if quantized is not None else self.vectors
+    dims = codes.shape[1] if codes is not None else 0
+    return {
+      'k': k,
+      'queries': len(queries),
+      'quantization': self.quantization,
+      'recall': recall / count,
+      'first_pass_recall': first_pass_recall / count,
+      'bytes_per_vector': codes.itemsize * dims if codes is not None else 0,
+    }
+
+  def save(self) -> None:
+    """
+    Persist the live rows to the index file, with the vectors stored as
+    the configured dtype (float32 or float16). Saves of one index are
+    serialized, and each writes the rows as they are when it starts.
+    """
+    if not self.path:
+      return
+    with self.write_lock:
+      with self.lock:
+        keep = np.flatnonzero(self.alive[:self.size])
+        vectors = self.vectors[keep] if len(keep) else np.zeros((0, 0), dtype=np.float32)
+        ids = [self.ids[row] for row in keep]
+        texts = [self.texts[row] for row in keep]
+        metadatas = [self.metadatas[row] for row in keep]
+        self.dirty = False
+      try:
+        stat = write_index(self.path, ids, texts, metadatas, vectors, self.dtype)
+      except Exception:
+        with self.lock:
+          self.dirty = True
+        raise
+      with self.lock:
+        self.file_stamp = (stat.st_ino, stat.st_mtime_ns)
+
+  def flush(self) -> None:
+    """
+    Save the index when it has writes that are not on disk yet.
+    """
+    if self.dirty:
+      self.save()
+
+  def load(self) -> None:
+    """
+    Map a saved index file. Opening costs a header read; ids, texts and
+    metadata are decoded only when a row is accessed.
+    """
+    stat = os.stat(self.path)
+    vectors, ids, texts, metadatas = open_index(self.path)
+    with self.lock:
+      self.file_stamp = (stat.st_ino, stat.st_mtime_ns)
+      self.ids = ids
+      self.texts = texts
+      self.metadatas = metadatas
+      self.rows = None
+      self.size = len(ids)
+      self.vectors = vectors if self.size else None
+      self.alive = np.ones(self.size, dtype=bool)
+      self.columns = {}
+      self.dirty = False
+      self.generation += 1
+      self.ivf = None
+      self.quantized = None
+
+  def refresh(self) -> bool:
+    """
+    Reopen the index file when it was replaced since this index loaded or
+    saved it, at most once per REFRESH_INTERVAL. Unsaved local writes win:
+    the file is then left alone and overwritten by the next save.
+
+    Returns:
+        bool: Whether the file was reopened.
+    """
+    now = time.monotonic()
+    if not self.path or now - self.checked_at < REFRESH_INTERVAL:
+      return False
+    self.checked_at = now
+    try:
+      stat = os.stat(self.path)
+    except FileNotFoundError:
+      return False
+    with self.lock:
+      if self.dirty or (stat.st_ino, stat.st_mtime_ns) == self.file_stamp:
+        return False
+      self.load()
+    return True
@@ -10,6 +10,7 @@ from ai_enterprise_agent.interface.settings import VECTOR_STORE_TYPE, ISettings
 from ai_enterprise_agent.interface.vector_search import ISearchType
 from ai_enterprise_agent.services.vector_store.embedding import \
     EmbeddingFactory
+from ai_enterprise_agent.utils.executor_helper import run_in_executor
 
 
 class PineconeVectorSearch(VectorStore):
@@ -25,11 +26,12 @@ class PineconeVectorSearch(VectorStore):
     embeddings = EmbeddingFactory.build(VECTOR_STORE_TYPE.pinecone, self.config)
     return PineconeVectorStore(pinecone_api_key=config.get('api_key'), embedding=embeddings, index_name=config.get('index_name'))
 
-  def similarity_search(self, query: str, k: int = 4, filters:str = None) -> List[Document]:
+  def similarity_search(self, query: str, k: int = 4, filters:str = None, **kwargs: Any) -> List[Document]:
     return self.vector_store.similarity_search(
       query=query,
       k=k,
-      filter=filters
+      filter=filters,
+      **kwargs
     )
 
   def similarity_search_with_relevance_scores(self, query: str,  score_threshold: float, k: Optional[int]) -> List[Tuple[Document, float]]:
@@ -42,8 +44,23 @@ class PineconeVectorSearch(VectorStore):
   def search(self, query: str, search_type: str = ISearchType.similarity, **kwargs: Any) -> List[Document]:
     return self.vector_store.search(query, search_type, **kwargs)
 
-  def add_documents(self, documents: List[Document]):
-    self.vector_store.add_documents(documents=documents)
+  def add_documents(self, documents: List[Document], **kwargs: Any):
+    ids = [getattr(document, 'id', None) for document in documents]
+    if all(ids):
+      kwargs.setdefault('ids', ids)
+    return self.vector_store.add_documents(documents=documents, **kwargs)
+
+  def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+    return self.vector_store.delete(ids=ids, **kwargs)
+
+  async def asimilarity_search(self, query: str, k: int = 4, filters: str = None, **kwargs: Any) -> List[Document]:
+    return await run_in_executor(self.similarity_search, query=query, k=k, filters=filters, **kwargs)
+
+  async def aadd_documents(self, documents: List[Document], **kwargs: Any) -> List[str]:
+    return await run_in_executor(self.add_documents, documents, **kwargs)
+
+  async def adelete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+    return await run_in_executor(self.delete, ids=ids, **kwargs)
 
   def add_texts(
         self,
@@ -0,0 +1,63 @@
+from typing import Optional
+
+import numpy as np
+
+QUANTIZATION_TYPES = ('float16', 'int8')
+BLOCK_SIZE = 65536
+
+
+class QuantizedVectors:
+  """
+  Scalar-quantized copy of the first `rows` vectors of an index, used for a
+  cheap first scoring pass before re-ranking at full precision.
+
+  float16 halves the memory of float32. int8 quarters it: each dimension is
+  scaled by its maximum absolute value over the corpus, so a code is
+  round(x / scale) in [-127, 127] and the dot product with a query is
+  codes @ (query * scale).
+  """
+
+  def __init__(self, kind: str, codes: np.ndarray, scale: Optional[np.ndarray]) -> None:
+    self.kind = kind
+    self.codes = codes
+    self.scale = scale
+    self.rows = codes.shape[0]
+
+  @staticmethod
+  def build(kind: str, vectors: np.ndarray) -> 'QuantizedVectors':
+    if kind not in QUANTIZATION_TYPES:
+      raise ValueError(f"Invalid quantization type: {kind}")
+    rows, dims = vectors.shape
+    if kind == 'float16':
+      codes = np.empty((rows, dims), dtype=np.float16)
+      for start in range(0, rows, BLOCK_SIZE):
+        codes[start:start + BLOCK_SIZE] = vectors[start:start + BLOCK_SIZE]
+      return QuantizedVectors(kind, codes, None)
+
+    maximum = np.zeros(dims, dtype=np.float32)
+    for start in range(0, rows, BLOCK_SIZE):
+      block = np.abs(np.asarray(vectors[start:start + BLOCK_SIZE], dtype=np.float32))
+      np.maximum(maximum, block.max(axis=0), out=maximum)
+    scale = np.where(maximum > 0, maximum / 127, 1).astype(np.float32)
+    codes = np.empty((rows, dims), dtype=np.int8)
+    for start in range(0, rows, BLOCK_SIZE):
+      block = np.asarray(vectors[start:start + BLOCK_SIZE], dtype=np.float32) / scale
+      codes[start:start + BLOCK_SIZE] = np.clip(np.rint(block), -127, 127)
+    return QuantizedVectors(kind, codes, scale)
+
+  def nbytes(self) -> int:
+    return self.codes.nbytes + (self.scale.nbytes if self.scale is not None else 0)
+
+  def score(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Approximate dot products of the query with the given rows (all rows when
+    None), computed block by block in float32.
+    """
+    query = query * self.scale if self.scale is not None else query
+    count = self.rows if rows is None else len(rows)
+    scores = np.empty(count, dtype=np.float32)
+    for start in range(0, count, BLOCK_SIZE):
+      end = min(start + BLOCK_SIZE, count)
+      block = self.codes[start:end] if rows is None else self.codes[rows[start:end]]
+      scores[start:end] = block.astype(np.float32) @ query
+    return scores
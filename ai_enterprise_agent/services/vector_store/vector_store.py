@@ -4,6 +4,7 @@ from langchain_core.vectorstores import VectorStore
 from ai_enterprise_agent.interface.settings import VECTOR_STORE_TYPE, ISettings
 from ai_enterprise_agent.services.vector_store.aws import AwsVectorSearch
 from ai_enterprise_agent.services.vector_store.azure import AzureVectorSearch
+from ai_enterprise_agent.services.vector_store.local import LocalVectorSearch
 from ai_enterprise_agent.services.vector_store.pinecone import \
     PineconeVectorSearch
 
@@ -19,6 +20,8 @@ class VectorStoreFactory:
       vector_search = AwsVectorSearch(config, model)
     elif vector_store_config.get('type') == VECTOR_STORE_TYPE.pinecone:
       vector_search = PineconeVectorSearch(config, model)
+    elif vector_store_config.get('type') == VECTOR_STORE_TYPE.local:
+      vector_search = LocalVectorSearch(config, model)
     else:
       raise Exception("Invalid vector search type")
     return vector_search
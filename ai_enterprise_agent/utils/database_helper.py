@@ -0,0 +1,93 @@
+import threading
+from typing import Any, Dict, Optional
+
+from langchain_community.utilities.sql_database import SQLDatabase
+from sqlalchemy import URL, create_engine
+from sqlalchemy.engine import Engine
+
+DEFAULT_POOL_OPTIONS: Dict[str, Any] = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800,
+    'pool_timeout': 30,
+}
+
+
+class EngineRegistry:
+    """
+    Process-wide registry of SQLAlchemy engines keyed by connection URL.
+
+    Every chain pointing at the same database shares one engine and
+    therefore one connection pool. Pool options are applied when the engine
+    is first created; later callers reuse it as is.
+    """
+
+    _engines: Dict[str, Engine] = {}
+    _databases: Dict[str, SQLDatabase] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def build_key(url: URL) -> str:
+        if isinstance(url, URL):
+            return url.render_as_string(hide_password=False)
+        return str(url)
+
+    @classmethod
+    def get_engine(cls, url: URL, **pool_options: Any) -> Engine:
+        """
+        Return the shared engine for the URL, creating it on first use.
+
+        Args:
+            url (URL): The connection URL.
+            **pool_options: pool_size, max_overflow, pool_pre_ping, pool_recycle and pool_timeout.
+
+        Returns:
+            Engine: The pooled engine.
+        """
+        key = cls.build_key(url)
+        engine = cls._engines.get(key)
+        if engine is not None:
+            return engine
+
+        with cls._lock:
+            engine = cls._engines.get(key)
+            if engine is None:
+                options = {**DEFAULT_POOL_OPTIONS, **{k: v for k, v in pool_options.items() if v is not None}}
+                if key.startswith('sqlite'):
+                    options = {}
+                engine = create_engine(url, **options)
+                cls._engines[key] = engine
+            return engine
+
+    @classmethod
+    def get_database(cls, url: URL, **pool_options: Any) -> SQLDatabase:
+        """
+        Return the shared SQLDatabase wrapper for the URL, so table reflection
+        also happens once per process.
+        """
+        key = cls.build_key(url)
+        database = cls._databases.get(key)
+        if database is not None:
+            return database
+
+        engine = cls.get_engine(url, **pool_options)
+        with cls._lock:
+            database = cls._databases.get(key)
+            if database is None:
+                database = SQLDatabase(engine)
+                cls._databases[key] = database
+            return database
+
+    @classmethod
+    def dispose(cls, url: Optional[URL] = None) -> None:
+        """
+        Close the pooled connections of one URL, or of every registered engine.
+        """
+        with cls._lock:
+            keys = [cls.build_key(url)] if url is not None else list(cls._engines.keys())
+            for key in keys:
+                engine = cls._engines.pop(key, None)
+                cls._databases.pop(key, None)
+                if engine is not None:
+                    engine.dispose()
@@ -1,33 +1,262 @@
+import asyncio
 import json
-from typing import Any, Dict, Optional
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 
+from ai_enterprise_agent.utils.http_cache_helper import (HttpCacheEntry,
+                                                        HttpResponseCache)
 
-def fetch(url: str, method: str, data: Dict[str, Any] = None, headers: Dict[str, str] = None) -> Optional[Dict[str, Any]]:
+HTTP_METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}
+IDEMPOTENT_METHODS = {'GET', 'PUT', 'DELETE'}
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+_sessions: Dict[int, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_async_sessions: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, aiohttp.ClientSession]]' = weakref.WeakKeyDictionary()
+
+
+class RetryableStatusError(Exception):
+    """
+    Resposta com status transitório (429, 5xx) que pode ser repetida.
+    """
+
+    def __init__(self, status: int) -> None:
+        super().__init__(f"Status HTTP transitório: {status}")
+        self.status = status
+
+
+def validate_method(method: Optional[str]) -> str:
+    """
+    Normaliza e valida o método HTTP.
+
+    Args:
+        method (str): O método HTTP informado.
+
+    Returns:
+        str: O método em maiúsculas.
+    """
+    method = (method or '').upper()
+    if method not in HTTP_METHODS:
+        raise ValueError(f"Método HTTP inválido. Use um de: {', '.join(sorted(HTTP_METHODS))}.")
+    return method
+
+
+def retry_delay(attempt: int, backoff: float) -> float:
+    """
+    Calcula a espera antes da próxima tentativa (backoff exponencial com jitter total).
+    """
+    return random.uniform(0, backoff * (2 ** attempt))
+
+
+def lookup_cache(
+    cache: Optional[HttpResponseCache],
+    url: str,
+    method: str,
+    data: Dict[str, Any] = None,
+    headers: Dict[str, str] = None,
+) -> Tuple[Optional[str], Optional[HttpCacheEntry]]:
+    """
+    Procura a resposta em cache. Apenas solicitações GET são armazenadas.
+
+    Returns:
+        Tuple[str, HttpCacheEntry]: A chave do cache e a entrada encontrada, ou None.
+    """
+    if cache is None or method != 'GET':
+        return None, None
+    key = cache.build_key(url, method, data, headers)
+    return key, cache.lookup(key)
+
+
+def conditional_headers(cache: Optional[HttpResponseCache], entry: Optional[HttpCacheEntry], headers: Dict[str, str] = None) -> Optional[Dict[str, str]]:
+    """
+    Acrescenta If-None-Match / If-Modified-Since para revalidar uma entrada expirada.
+    """
+    if entry is None:
+        return headers
+    return {**(headers or {}), **cache.validators(entry)}
+
+
+def get_session(max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST) -> requests.Session:
+    """
+    Retorna a sessão síncrona compartilhada, que reaproveita conexões keep-alive.
+
+    Args:
+        max_connections_per_host (int, opcional): Conexões mantidas por host. Padrão é 10.
+
+    Returns:
+        requests.Session: A sessão com o pool de conexões.
+    """
+    with _sessions_lock:
+        session = _sessions.get(max_connections_per_host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_connections_per_host, pool_maxsize=max_connections_per_host)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[max_connections_per_host] = session
+        return session
+
+
+def get_async_session(max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST) -> aiohttp.ClientSession:
+    """
+    Retorna a sessão assíncrona compartilhada do event loop atual. Uma sessão
+    aiohttp fica presa ao loop em que foi criada, por isso há uma por loop.
+
+    Args:
+        max_connections_per_host (int, opcional): Limite de conexões simultâneas por host. Padrão é 10.
+
+    Returns:
+        aiohttp.ClientSession: A sessão com o pool de conexões.
+    """
+    loop = asyncio.get_running_loop()
+    sessions = _async_sessions.setdefault(loop, {})
+    session = sessions.get(max_connections_per_host)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=max_connections_per_host, keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT)
+        session = aiohttp.ClientSession(connector=connector)
+        sessions[max_connections_per_host] = session
+    return session
+
+
+async def aclose() -> None:
+    """
+    Fecha as sessões assíncronas do event loop atual.
+    """
+    sessions = _async_sessions.pop(asyncio.get_running_loop(), {})
+    for session in sessions.values():
+        await session.close()
+
+
+def fetch(
+    url: str,
+    method: str,
+    data: Dict[str, Any] = None,
+    headers: Dict[str, str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    cache: Optional[HttpResponseCache] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Faz uma solicitação HTTP para a URL fornecida.
 
     Args:
         url (str): A URL para fazer a solicitação.
-        method (str): O método HTTP a ser usado (por exemplo, 'GET', 'POST').
+        method (str): O método HTTP a ser usado ('GET', 'POST', 'PUT', 'PATCH' ou 'DELETE').
+        data (Dict[str, Any], opcional): O corpo da solicitação em formato JSON. Padrão é None.
+        headers (Dict[str, str], opcional): Os cabeçalhos da solicitação. Padrão é None.
+        timeout (float, opcional): Tempo máximo da solicitação em segundos. Padrão é 30.
+        max_retries (int, opcional): Novas tentativas para métodos idempotentes. Padrão é 2.
+        retry_backoff (float, opcional): Base do backoff entre tentativas, em segundos. Padrão é 0.5.
+        max_connections_per_host (int, opcional): Conexões mantidas por host. Padrão é 10.
+        cache (HttpResponseCache, opcional): Cache das respostas GET. Padrão é None.
+
+    Returns:
+        Dict[str, Any] or None: Os dados da resposta JSON, se a solicitação for bem-sucedida. None caso contrário.
+    """
+    try:
+        method = validate_method(method)
+        retries = max_retries if method in IDEMPOTENT_METHODS else 0
+        cache_key, entry = lookup_cache(cache, url, method, data, headers)
+        if entry is not None and entry.fresh():
+            return entry.body
+        request_headers = conditional_headers(cache, entry, headers)
+        session = get_session(max_connections_per_host)
+        for attempt in range(retries + 1):
+            try:
+                response = session.request(method, url, json=data, headers=request_headers, timeout=timeout)
+                if entry is not None and response.status_code == 304:
+                    return cache.revalidate(cache_key, entry, response.headers)
+                if response.status_code in RETRY_STATUSES and attempt < retries:
+                    raise RetryableStatusError(response.status_code)
+                response.raise_for_status()
+                body = response.json()
+                if cache_key is not None:
+                    cache.store(cache_key, response.headers, body)
+                return body
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, RetryableStatusError):
+                if attempt >= retries:
+                    raise
+                time.sleep(retry_delay(attempt, retry_backoff))
+    except (requests.exceptions.RequestException, RetryableStatusError) as e:
+        print(f"Erro ao fazer a solicitação para {url}: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        print(f"Erro ao decodificar JSON da resposta de {url}: {e}")
+        return None
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return None
+
+
+async def afetch(
+    url: str,
+    method: str,
+    data: Dict[str, Any] = None,
+    headers: Dict[str, str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    cache: Optional[HttpResponseCache] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Versão assíncrona de fetch, sobre uma sessão aiohttp com pool de conexões
+    compartilhado, sem bloquear o event loop.
+
+    Args:
+        url (str): A URL para fazer a solicitação.
+        method (str): O método HTTP a ser usado ('GET', 'POST', 'PUT', 'PATCH' ou 'DELETE').
         data (Dict[str, Any], opcional): O corpo da solicitação em formato JSON. Padrão é None.
         headers (Dict[str, str], opcional): Os cabeçalhos da solicitação. Padrão é None.
+        timeout (float, opcional): Tempo máximo da solicitação em segundos. Padrão é 30.
+        max_retries (int, opcional): Novas tentativas para métodos idempotentes. Padrão é 2.
+        retry_backoff (float, opcional): Base do backoff entre tentativas, em segundos. Padrão é 0.5.
+        max_connections_per_host (int, opcional): Limite de conexões simultâneas por host. Padrão é 10.
+        cache (HttpResponseCache, opcional): Cache das respostas GET. Padrão é None.
 
     Returns:
         Dict[str, Any] or None: Os dados da resposta JSON, se a solicitação for bem-sucedida. None caso contrário.
     """
     try:
-        if method.upper() == 'GET':
-            response = requests.get(url, json=data, headers=headers)
-        elif method.upper() == 'POST':
-            response = requests.post(url, json=data, headers=headers)
-        else:
-            raise ValueError("Método HTTP inválido. Use 'GET' ou 'POST'.")
-
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        method = validate_method(method)
+        retries = max_retries if method in IDEMPOTENT_METHODS else 0
+        cache_key, entry = lookup_cache(cache, url, method, data, headers)
+        if entry is not None and entry.fresh():
+            return entry.body
+        request_headers = conditional_headers(cache, entry, headers)
+        session = get_async_session(max_connections_per_host)
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        for attempt in range(retries + 1):
+            try:
+                async with session.request(method, url, json=data, headers=request_headers, timeout=client_timeout) as response:
+                    if entry is not None and response.status == 304:
+                        return cache.revalidate(cache_key, entry, response.headers)
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        raise RetryableStatusError(response.status)
+                    response.raise_for_status()
+                    body = await response.json(content_type=None)
+                    if cache_key is not None:
+                        cache.store(cache_key, response.headers, body)
+                    return body
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError, RetryableStatusError):
+                if attempt >= retries:
+                    raise
+                await asyncio.sleep(retry_delay(attempt, retry_backoff))
+    except (aiohttp.ClientError, asyncio.TimeoutError, RetryableStatusError) as e:
         print(f"Erro ao fazer a solicitação para {url}: {e}")
         return None
     except json.JSONDecodeError as e:
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_SIZE = 512
+DEFAULT_AUTH_HEADER = 'Authorization'
+
+
+@dataclass
+class HttpCacheEntry:
+    body: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class HttpResponseCache:
+    """
+    Bounded LRU cache of downstream GET responses.
+
+    Freshness comes from Cache-Control (s-maxage, max-age, no-cache, no-store)
+    or Expires, falling back to the configured TTL. Stale entries that carry an
+    ETag or Last-Modified are revalidated with a conditional request, and a 304
+    serves the cached body again.
+    """
+
+    _caches: Dict[Tuple[int, int, str], 'HttpResponseCache'] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, ttl: int = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE, auth_header: str = DEFAULT_AUTH_HEADER) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.auth_header = auth_header.lower()
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def from_config(config: Optional[Dict[str, Any]]) -> Optional['HttpResponseCache']:
+        """
+        Return the response cache shared by every chain with the same settings.
+
+        Args:
+            config (Dict[str, Any]): The cache configuration (IHttpCache).
+
+        Returns:
+            HttpResponseCache or None: The cache, when enabled.
+        """
+        if not config or not config.get('enabled', True):
+            return None
+        key = (
+            config.get('ttl') or DEFAULT_TTL,
+            config.get('max_size') or DEFAULT_MAX_SIZE,
+            config.get('auth_header') or DEFAULT_AUTH_HEADER,
+        )
+        with HttpResponseCache._lock:
+            cache = HttpResponseCache._caches.get(key)
+            if cache is None:
+                cache = HttpResponseCache(ttl=key[0], max_size=key[1], auth_header=key[2])
+                HttpResponseCache._caches[key] = cache
+            return cache
+
+    def build_key(self, url: str, method: str, data: Any = None, headers: Optional[Mapping[str, str]] = None) -> str:
+        auth = next((value for name, value in (headers or {}).items() if name.lower() == self.auth_header), None)
+        source = json.dumps([method.upper(), url, data, auth], sort_keys=True, default=str)
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str) -> Optional[HttpCacheEntry]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def validators(self, entry: HttpCacheEntry) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def freshness(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Seconds the response may be served without revalidation, or None when
+        it must not be stored at all.
+        """
+        directives = {}
+        for directive in (headers.get('Cache-Control') or '').split(','):
+            name, _, value = directive.strip().partition('=')
+            if name:
+                directives[name.lower()] = value.strip('"')
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+        for name in ('s-maxage', 'max-age'):
+            if directives.get(name, '').isdigit():
+                return int(directives[name])
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                return max(parsedate_to_datetime(expires).timestamp() - time.time(), 0)
+            except (TypeError, ValueError):
+                return 0
+        return self.ttl
+
+    def store(self, key: str, headers: Mapping[str, str], body: Any) -> None:
+        ttl = self.freshness(headers)
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        if ttl is None or (ttl <= 0 and not etag and not last_modified):
+            return
+        with self.lock:
+            self.entries[key] = HttpCacheEntry(body=body, etag=etag, last_modified=last_modified, expires_at=time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def revalidate(self, key: str, entry: HttpCacheEntry, headers: Mapping[str, str]) -> Any:
+        """
+        Extend a stale entry after a 304 Not Modified and return its body.
+        """
+        ttl = self.freshness(headers)
+        with self.lock:
+            entry.expires_at = time.monotonic() + (ttl or 0)
+            entry.etag = headers.get('ETag') or entry.etag
+            entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+        return entry.body
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
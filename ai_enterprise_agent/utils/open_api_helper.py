@@ -0,0 +1,184 @@
+import hashlib
+import json
+import math
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union
+
+import yaml
+
+from ai_enterprise_agent.utils.text_helper import tokenize
+
+HTTP_METHODS = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
+MAX_REF_DEPTH = 3
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def load_spec(data: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Load an OpenAPI/Swagger specification written in JSON or YAML.
+
+    Args:
+        data (str or Dict[str, Any]): The specification as text or already parsed.
+
+    Returns:
+        Dict[str, Any]: The parsed specification, empty when it cannot be parsed.
+    """
+    if isinstance(data, dict):
+        return data
+    if not data:
+        return {}
+    try:
+        spec = json.loads(data)
+        return spec if isinstance(spec, dict) else {}
+    except (TypeError, ValueError):
+        pass
+    try:
+        spec = yaml.safe_load(data)
+        return spec if isinstance(spec, dict) else {}
+    except yaml.YAMLError as e:
+        print(f"Error parsing OpenAPI specification: {e}")
+        return {}
+
+
+def parse_operations(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    List the operations of an OpenAPI/Swagger specification.
+
+    Args:
+        spec (Dict[str, Any]): The parsed specification.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per operation with path, method, operation_id,
+        summary, description, tags, parameters and request_body.
+    """
+    operations = []
+    for path, item in (spec.get('paths') or {}).items():
+        if not isinstance(item, dict):
+            continue
+        shared_parameters = item.get('parameters') or []
+        for method in HTTP_METHODS:
+            operation = item.get(method)
+            if not isinstance(operation, dict):
+                continue
+            operations.append({
+                'path': path,
+                'method': method.upper(),
+                'operation_id': operation.get('operationId'),
+                'summary': operation.get('summary') or '',
+                'description': operation.get('description') or '',
+                'tags': operation.get('tags') or [],
+                'parameters': shared_parameters + (operation.get('parameters') or []),
+                'request_body': operation.get('requestBody'),
+            })
+    return operations
+
+
+def resolve_refs(spec: Dict[str, Any], node: Any, depth: int = 0) -> Any:
+    """
+    Inline local $ref pointers ('#/components/schemas/...', '#/definitions/...')
+    up to MAX_REF_DEPTH levels, so an operation can be shown on its own.
+    """
+    if isinstance(node, list):
+        return [resolve_refs(spec, item, depth) for item in node]
+    if not isinstance(node, dict):
+        return node
+    ref = node.get('$ref')
+    if isinstance(ref, str) and ref.startswith('#/'):
+        if depth >= MAX_REF_DEPTH:
+            return {'$ref': ref}
+        target: Any = spec
+        for part in ref[2:].split('/'):
+            target = target.get(part.replace('~1', '/').replace('~0', '~'), {}) if isinstance(target, dict) else {}
+        return resolve_refs(spec, target, depth + 1)
+    return {key: resolve_refs(spec, value, depth) for key, value in node.items()}
+
+
+class OperationIndex:
+    """
+    Parsed OpenAPI specification with a BM25 index over its operations.
+
+    The spec is parsed once; each question then retrieves only the top-k
+    relevant operations, rendered with their parameters and request body
+    schema, instead of sending the whole document to the model.
+    """
+
+    _cache: Dict[str, 'OperationIndex'] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.spec = spec
+        self.operations = parse_operations(spec)
+        self.terms = [Counter(tokenize(self.describe(operation))) for operation in self.operations]
+        self.lengths = [sum(terms.values()) for terms in self.terms]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        frequency: Counter = Counter()
+        for terms in self.terms:
+            frequency.update(terms.keys())
+        total = len(self.terms)
+        self.idf = {term: math.log(1 + (total - count + 0.5) / (count + 0.5)) for term, count in frequency.items()}
+
+    @staticmethod
+    def from_data(data: Union[str, Dict[str, Any]]) -> 'OperationIndex':
+        """
+        Return the index for a specification, shared by every chain using the same spec.
+        """
+        source = json.dumps(data, sort_keys=True, default=str) if isinstance(data, dict) else str(data)
+        key = hashlib.sha1(source.encode('utf-8')).hexdigest()
+        with OperationIndex._lock:
+            index = OperationIndex._cache.get(key)
+            if index is None:
+                index = OperationIndex(load_spec(data))
+                OperationIndex._cache[key] = index
+            return index
+
+    @staticmethod
+    def describe(operation: Dict[str, Any]) -> str:
+        parameters = ' '.join(f"{parameter.get('name', '')} {parameter.get('description', '')}" for parameter in operation['parameters'] if isinstance(parameter, dict))
+        return ' '.join([
+            operation['path'],
+            operation['operation_id'] or '',
+            operation['summary'],
+            operation['description'],
+            ' '.join(operation['tags']),
+            parameters,
+        ])
+
+    def base_url(self) -> Optional[str]:
+        servers = self.spec.get('servers') or []
+        if servers and isinstance(servers[0], dict):
+            return servers[0].get('url')
+        if self.spec.get('host'):
+            scheme = (self.spec.get('schemes') or ['https'])[0]
+            return f"{scheme}://{self.spec['host']}{self.spec.get('basePath', '')}"
+        return None
+
+    def search(self, question: str, k: int = 5) -> List[Dict[str, Any]]:
+        query = set(tokenize(question))
+        scored = []
+        for i, terms in enumerate(self.terms):
+            score = 0.0
+            for term in query & terms.keys():
+                tf = terms[term]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[i] / (self.average_length or 1))
+                score += self.idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+            scored.append((score, i))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [self.operations[i] for score, i in scored[:k] if score > 0] or self.operations[:k]
+
+    def render(self, operations: List[Dict[str, Any]]) -> str:
+        components = self.spec.get('components') or {}
+        document = {
+            'base_url': self.base_url(),
+            'security': components.get('securitySchemes') or self.spec.get('securityDefinitions'),
+            'operations': [resolve_refs(self.spec, {
+                'method': operation['method'],
+                'path': operation['path'],
+                'operation_id': operation['operation_id'],
+                'summary': operation['summary'],
+                'parameters': operation['parameters'],
+                'request_body': operation['request_body'],
+            }) for operation in operations],
+        }
+        return json.dumps(document, default=str)
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Tuple
+
+from redis import Connection, ConnectionPool, Redis, SSLConnection
+from redis import asyncio as aioredis
+
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_HEALTH_CHECK_INTERVAL = 30
+
+
+class RedisRegistry:
+    """
+    Process-wide registry of Redis connection pools keyed by host, port,
+    database, SSL and user.
+
+    Chat histories and caches pointing at the same server share one pool, so
+    a request borrows an open connection instead of opening a new one. Pool
+    options are applied when the pool is first created; later callers reuse
+    it as is.
+    """
+
+    _pools: Dict[Tuple[Any, ...], ConnectionPool] = {}
+    _async_pools: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, ...], aioredis.ConnectionPool]]' = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def pool_options(config: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'password': config.get('password'),
+            'max_connections': config.get('max_connections') or DEFAULT_MAX_CONNECTIONS,
+            'health_check_interval': config.get('health_check_interval') or DEFAULT_HEALTH_CHECK_INTERVAL,
+        }
+
+    @staticmethod
+    def build_key(config: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            config.get('host'),
+            int(config.get('port') or 6379),
+            int(config.get('database') or 0),
+            bool(config.get('ssl', False)),
+            config.get('username'),
+        )
+
+    @classmethod
+    def get_pool(cls, config: Dict[str, Any]) -> ConnectionPool:
+        """
+        Return the shared connection pool for the server, creating it on first use.
+
+        Args:
+            config (Dict[str, Any]): host, port, database, ssl, username, password,
+                max_connections and health_check_interval.
+
+        Returns:
+            ConnectionPool: The pool.
+        """
+        key = cls.build_key(config)
+        pool = cls._pools.get(key)
+        if pool is not None:
+            return pool
+
+        with cls._lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                host, port, db, ssl, username = key
+                pool = ConnectionPool(
+                    connection_class=SSLConnection if ssl else Connection,
+                    host=host,
+                    port=port,
+                    db=db,
+                    username=username,
+                    **cls.pool_options(config),
+                )
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def get_client(cls, config: Dict[str, Any]) -> Redis:
+        """
+        Return a client over the shared pool. Clients are cheap; the pool
+        holds the connections.
+        """
+        return Redis(connection_pool=cls.get_pool(config))
+
+    @classmethod
+    def get_async_client(cls, config: Dict[str, Any]) -> aioredis.Redis:
+        """
+        Return an asyncio client over the pool of the running event loop.
+        asyncio connections are bound to the loop that opened them, so each
+        loop gets its own pool, dropped together with the loop.
+        """
+        loop = asyncio.get_running_loop()
+        pools = cls._async_pools.setdefault(loop, {})
+        key = cls.build_key(config)
+        pool = pools.get(key)
+        if pool is None:
+            host, port, db, ssl, username = key
+            pool = aioredis.ConnectionPool(
+                connection_class=aioredis.SSLConnection if ssl else aioredis.Connection,
+                host=host,
+                port=port,
+                db=db,
+                username=username,
+                **cls.pool_options(config),
+            )
+            pools[key] = pool
+        return aioredis.Redis(connection_pool=pool)
+
+    @classmethod
+    def dispose(cls) -> None:
+        """
+        Close the connections of every registered pool.
+        """
+        with cls._lock:
+            for pool in cls._pools.values():
+                pool.disconnect()
+            cls._pools.clear()
@@ -0,0 +1,33 @@
+import re
+from typing import List
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'do', 'does', 'for', 'from', 'how', 'in', 'is', 'it',
+    'many', 'me', 'much', 'of', 'on', 'or', 'show', 'tell', 'that', 'the', 'there', 'this', 'to', 'was',
+    'what', 'when', 'where', 'which', 'who', 'why', 'with', 'you', 'all', 'get', 'list', 'our', 'we',
+}
+
+
+def stem(token: str) -> str:
+    """
+    Strip a plural suffix so 'employees' and 'employee' match.
+    """
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase lexical terms for the local indexes, breaking
+    camelCase and snake_case identifiers and dropping stopwords.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        List[str]: The terms, in order of appearance.
+    """
+    text = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', text or '')
+    tokens = re.findall(r'[a-z0-9]+', text.lower())
+    return [stem(token) for token in tokens if len(token) > 1 and token not in STOPWORDS]